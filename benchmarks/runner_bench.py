@@ -0,0 +1,130 @@
+"""End-to-end runner throughput benchmark against the in-process stub API.
+
+Generates N synthetic checks that each call ``GET /health`` through the real
+``HttpClient`` and runs them with ``core.runner.run_tests``. For every size it
+reports tests/sec, p99 scheduling overhead (idle gap on a worker between one
+test body ending and the next starting) and peak memory.
+
+    python benchmarks/runner_bench.py --sizes 10,1000,10000 --max-workers 16
+"""
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+# Reporter and the timing cache write relative to cwd; keep them out of the repo.
+os.chdir(tempfile.mkdtemp(prefix="it_tester_bench_"))
+
+from core import runner  # noqa: E402
+from core.registry import TestCase  # noqa: E402
+from network.http_client import HttpClient  # noqa: E402
+from network.stub_server import StubServer, fixed, lognormal  # noqa: E402
+from report.reporter import REPORTER, percentile  # noqa: E402
+
+Span = Tuple[str, float, float]
+
+
+def _make_cases(count: int, client: HttpClient, spans: List[Span], lock: threading.Lock) -> List[TestCase]:
+    def check() -> None:
+        started = time.perf_counter()
+        response = client.get("/health")
+        ended = time.perf_counter()
+        with lock:
+            spans.append((threading.current_thread().name, started, ended))
+        if response.status_code != 200:
+            raise AssertionError(f"status {response.status_code}")
+
+    return [TestCase(name=f"bench_{index:06d}", func=check, tags=["bench"]) for index in range(count)]
+
+
+def _scheduling_gaps(spans: List[Span]) -> List[float]:
+    by_thread: Dict[str, List[Span]] = {}
+    for span in spans:
+        by_thread.setdefault(span[0], []).append(span)
+    gaps: List[float] = []
+    for thread_spans in by_thread.values():
+        thread_spans.sort(key=lambda span: span[1])
+        for previous, current in zip(thread_spans, thread_spans[1:]):
+            gaps.append(max(current[1] - previous[2], 0.0) * 1000)
+    return sorted(gaps)
+
+
+def run_size(size: int, stub: StubServer, args: argparse.Namespace) -> Dict[str, Any]:
+    client = HttpClient(stub.base_url, timeout=args.timeout, retries=args.retries)
+    spans: List[Span] = []
+    cases = _make_cases(size, client, spans, threading.Lock())
+    REPORTER.reset()
+    if args.tracemalloc:
+        tracemalloc.start()
+
+    started = time.perf_counter()
+    summary = runner.run_tests(cases, args.max_workers, plugins=[], schedule_strategy="registry")
+    elapsed = time.perf_counter() - started
+
+    traced_peak = None
+    if args.tracemalloc:
+        traced_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    gaps = _scheduling_gaps(spans)
+    return {
+        "tests": size,
+        "max_workers": args.max_workers,
+        "elapsed_s": round(elapsed, 3),
+        "tests_per_sec": round(size / elapsed, 1) if elapsed else None,
+        "sched_overhead_p50_ms": round(percentile(gaps, 50), 3) if gaps else None,
+        "sched_overhead_p99_ms": round(percentile(gaps, 99), 3) if gaps else None,
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "traced_peak_mb": round(traced_peak / 1024 / 1024, 1) if traced_peak is not None else None,
+        "passed": summary.get("passed", 0),
+        "failed": summary.get("failed", 0) + summary.get("error", 0),
+    }
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Runner throughput benchmark against a local stub API")
+    parser.add_argument("--sizes", default="10,1000,10000", help="Comma separated test counts")
+    parser.add_argument("--max-workers", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="Median stub latency")
+    parser.add_argument("--latency-sigma", type=float, default=0.0, help="> 0 for lognormal (long-tail) latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Injected 503 ratio")
+    parser.add_argument("--timeout", type=float, default=5.0)
+    parser.add_argument("--retries", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--tracemalloc", action="store_true", help="Also report Python heap peak (slower)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str]) -> int:
+    args = parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    latency = lognormal(args.latency_ms, args.latency_sigma) if args.latency_sigma > 0 else fixed(args.latency_ms)
+    rows = []
+    with StubServer(seed=args.seed) as stub:
+        stub.route("GET", "/health", latency=latency, error_rate=args.error_rate)
+        for size in sizes:
+            rows.append(run_size(size, stub, args))
+            if not args.json:
+                row = rows[-1]
+                print(
+                    f"{row['tests']:>7} tests  {row['tests_per_sec']:>9} tests/s  "
+                    f"sched p99 {row['sched_overhead_p99_ms']} ms  peak rss {row['peak_rss_mb']} MB"
+                )
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
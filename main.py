@@ -3,6 +3,7 @@ import logging
 import pkgutil
 import sys
 from pathlib import Path
+from typing import List
 
 ROOT = Path(__file__).resolve().parent
 SRC = ROOT / "src"
@@ -23,6 +24,9 @@ except ImportError:
     sys.path.append(str(SRC))
     from core import runner  # type: ignore  # fallback for misconfigured environments
 
+from core.discovery import DiscoveryManifest
+from core.settings import settings
+
 
 def _import_all_tests() -> None:
     tests_pkg_path = ROOT / "tests"
@@ -35,6 +39,26 @@ def _import_all_tests() -> None:
         importlib.import_module(full_name)
 
 
+def _import_selected_tests(tags: List[str], exclude_tags: List[str]) -> None:
+    tests_pkg_path = ROOT / "tests"
+    if not tests_pkg_path.exists():
+        logging.warning("Tests directory not found at %s", tests_pkg_path)
+        return
+
+    cache_file = Path(settings.CACHE_DIR) / "discovery.json"
+    manifest = DiscoveryManifest(tests_pkg_path, cache_file).build()
+    modules = manifest.select_modules(tags, exclude_tags)
+    logging.debug("Discovery manifest selected %s/%s test modules", len(modules), len(manifest.modules))
+    for full_name in modules:
+        importlib.import_module(full_name)
+
+
 if __name__ == "__main__":
-    _import_all_tests()
+    if len(sys.argv) > 1 and sys.argv[1] == "merge":
+        raise SystemExit(runner.main(sys.argv))
+    cli_args = runner.parse_args(sys.argv)
+    if cli_args.list or not (cli_args.tag or cli_args.exclude_tag):
+        _import_all_tests()
+    else:
+        _import_selected_tests(cli_args.tag, cli_args.exclude_tag)
     raise SystemExit(runner.main(sys.argv))
@@ -22,11 +22,12 @@ class ConsolePlugin(Plugin):
 
     def on_finish(self, summary: Dict[str, Any]) -> None:
         log.info(
-            "ConsolePlugin: Finished -> total=%s passed=%s failed=%s error=%s skipped=%s anomaly=%s",
+            "ConsolePlugin: Finished -> total=%s passed=%s failed=%s error=%s timeout=%s skipped=%s anomaly=%s",
             summary.get("total"),
             summary.get("passed"),
             summary.get("failed"),
             summary.get("error"),
+            summary.get("timeout"),
             summary.get("skipped"),
             summary.get("anomaly_count"),
         )
@@ -1,19 +1,24 @@
 import logging
+import time
 from typing import Any, Dict
 
 import requests
 
+from core import alert_state
 from core.settings import settings
 from plugins.base import Plugin
 from report.reporter import TestResult
 
 log = logging.getLogger("it_tester.slack_plugin")
 
+CHANNEL = "slack"
+
 
 class SlackPlugin(Plugin):
     def __init__(self) -> None:
         self.webhook_url = settings.SLACK_WEBHOOK_URL.strip()
         self.enabled = bool(self.webhook_url)
+        self.sent = 0
 
     def _post(self, payload: Dict[str, Any]) -> None:
         if not self.enabled:
@@ -24,7 +29,8 @@ class SlackPlugin(Plugin):
             log.warning("Slack notification failed: %s", exc)
 
     def on_start(self, context: Dict[str, Any]) -> None:
-        if not self.enabled:
+        self.sent = 0
+        if not self.enabled or not settings.ALERT_RUN_NOTICES:
             return
         text = f"IT-Tester started for ENV={context.get('env')} (tests={context.get('test_count')})"
         self._post({"text": text})
@@ -32,20 +38,35 @@ class SlackPlugin(Plugin):
     def on_test_result(self, result: TestResult) -> None:
         if not self.enabled:
             return
-        if result.status not in {"FAILED", "ERROR"}:
+        kind = alert_state.STORE.decide(CHANNEL, result.name, result.status)
+        if kind is None:
             return
-        text = f"Alert: {result.name} -> {result.status}\n{result.details}".strip()
-        self._post({"text": text})
+        state = alert_state.STORE.get(CHANNEL, result.name)
+        minutes = int((time.time() - state.since) // 60) if state and state.since else 0
+        if kind == alert_state.ALERT:
+            text = f"Alert: {result.name} -> {result.status}\n{result.details}"
+        elif kind == alert_state.REMINDER:
+            text = f"Still failing for {minutes} min: {result.name} -> {result.status}\n{result.details}"
+        elif kind == alert_state.RESOLVED:
+            text = f"Resolved: {result.name} -> {result.status} (after {minutes} min)"
+        else:
+            text = f"Flapping: {result.name} keeps changing state (now {result.status}); alerts paused until it settles"
+        self.sent += 1
+        self._post({"text": text.strip()})
 
     def on_finish(self, summary: Dict[str, Any]) -> None:
         if not self.enabled:
             return
+        alert_state.STORE.save()
+        if not (self.sent or settings.ALERT_RUN_NOTICES):
+            return
         text = (
-            "IT-Tester finished: total={total}, passed={passed}, failed={failed}, error={error}, skipped={skipped}".format(
+            "IT-Tester finished: total={total}, passed={passed}, failed={failed}, error={error}, timeout={timeout}, skipped={skipped}".format(
                 total=summary.get("total"),
                 passed=summary.get("passed"),
                 failed=summary.get("failed"),
                 error=summary.get("error"),
+                timeout=summary.get("timeout", 0),
                 skipped=summary.get("skipped"),
             )
         )
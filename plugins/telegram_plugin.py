@@ -1,20 +1,25 @@
 import logging
+import time
 from typing import Any, Dict
 
 import requests
 
+from core import alert_state
 from core.settings import settings
 from plugins.base import Plugin
 from report.reporter import TestResult
 
 log = logging.getLogger("it_tester.telegram_plugin")
 
+CHANNEL = "telegram"
+
 
 class TelegramPlugin(Plugin):
     def __init__(self) -> None:
         self.bot_token = settings.TELEGRAM_BOT_TOKEN.strip()
         self.chat_id = settings.TELEGRAM_CHAT_ID.strip()
         self.enabled = bool(self.bot_token and self.chat_id)
+        self.sent = 0
 
     def _send(self, text: str) -> None:
         if not self.enabled:
@@ -27,7 +32,8 @@ class TelegramPlugin(Plugin):
             log.warning("Telegram notification failed: %s", exc)
 
     def on_start(self, context: Dict[str, Any]) -> None:
-        if not self.enabled:
+        self.sent = 0
+        if not self.enabled or not settings.ALERT_RUN_NOTICES:
             return
         text = (
             "*IT-Tester started*\n"
@@ -38,23 +44,42 @@ class TelegramPlugin(Plugin):
     def on_test_result(self, result: TestResult) -> None:
         if not self.enabled:
             return
-        if result.status not in {"FAILED", "ERROR"}:
+        kind = alert_state.STORE.decide(CHANNEL, result.name, result.status)
+        if kind is None:
             return
-        text = (
-            f"*Alert* — `{result.name}`\n"
-            f"Status: `{result.status}`\n"
-            f"Details: {result.details or 'n/a'}"
-        )
+        state = alert_state.STORE.get(CHANNEL, result.name)
+        minutes = int((time.time() - state.since) // 60) if state and state.since else 0
+        if kind == alert_state.ALERT:
+            text = (
+                f"*Alert* — `{result.name}`\n"
+                f"Status: `{result.status}`\n"
+                f"Details: {result.details or 'n/a'}"
+            )
+        elif kind == alert_state.REMINDER:
+            text = (
+                f"*Still failing* ({minutes} min) — `{result.name}`\n"
+                f"Status: `{result.status}`\n"
+                f"Details: {result.details or 'n/a'}"
+            )
+        elif kind == alert_state.RESOLVED:
+            text = f"*Resolved* — `{result.name}`\nStatus: `{result.status}` (after {minutes} min)"
+        else:
+            text = f"*Flapping* — `{result.name}`\nStatus: `{result.status}`; alerts paused until it settles"
+        self.sent += 1
         self._send(text)
 
     def on_finish(self, summary: Dict[str, Any]) -> None:
         if not self.enabled:
             return
+        alert_state.STORE.save()
+        if not (self.sent or settings.ALERT_RUN_NOTICES):
+            return
         text = (
             "*IT-Tester finished*\n"
             f"Total: `{summary.get('total')}`\n"
             f"Passed: `{summary.get('passed')}`\nFailed: `{summary.get('failed')}`\n"
-            f"Errors: `{summary.get('error')}`\nSkipped: `{summary.get('skipped')}`"
+            f"Errors: `{summary.get('error')}`\nTimeouts: `{summary.get('timeout', 0)}`\n"
+            f"Skipped: `{summary.get('skipped')}`"
         )
         self._send(text)
 
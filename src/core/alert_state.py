@@ -0,0 +1,190 @@
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from core.settings import settings
+
+log = logging.getLogger("it_tester.alert_state")
+
+FAILING = frozenset({"FAILED", "ERROR", "TIMEOUT"})
+ALERT = "alert"
+REMINDER = "reminder"
+RESOLVED = "resolved"
+FLAPPING = "flapping"
+# Entries of tests not seen for this long are dropped on save (renamed or removed tests).
+STALE_AFTER_S = 7 * 86400
+MIN_FLAP_SAMPLES = 4
+
+
+class AlertState:
+    """Alerting state of one test on one notification channel."""
+
+    __slots__ = ("alerting", "flapping", "since", "last_notified", "last_seen", "streak", "history")
+
+    def __init__(
+        self,
+        alerting: bool = False,
+        flapping: bool = False,
+        since: float = 0.0,
+        last_notified: float = 0.0,
+        last_seen: float = 0.0,
+        streak: int = 0,
+        history: str = "",
+    ) -> None:
+        self.alerting = alerting
+        self.flapping = flapping
+        self.since = since
+        self.last_notified = last_notified
+        self.last_seen = last_seen
+        self.streak = streak
+        self.history = history
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def flap_ratio(self, window: int) -> float:
+        """Share of state changes among the last ``window`` outcomes (0 = stable, 1 = alternating).
+
+        0 until the window is full: on a short history a single blip and recovery
+        would already look like flapping.
+        """
+        if len(self.history) < max(window, MIN_FLAP_SAMPLES):
+            return 0.0
+        changes = sum(1 for previous, current in zip(self.history, self.history[1:]) if previous != current)
+        return changes / (len(self.history) - 1)
+
+
+class AlertStateStore:
+    """Per (channel, test) alert state persisted between runs, so notifiers only send on transitions.
+
+    ``decide`` turns each result into at most one notification kind:
+
+    - ``alert`` after ``failures_to_alert`` consecutive failing runs,
+    - ``reminder`` while still failing, every ``reminder_s`` seconds (0 disables),
+    - ``resolved`` after ``passes_to_resolve`` consecutive passing runs,
+    - ``flapping`` once when the last ``flap_window`` outcomes (only judged once that
+      many are known) change state at least ``flap_high`` of the time; transitions are then suppressed until the ratio
+      drops to ``flap_low`` and the current state is re-evaluated.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        reminder_s: float = 3600.0,
+        failures_to_alert: int = 1,
+        passes_to_resolve: int = 1,
+        flap_window: int = 10,
+        flap_high: float = 0.5,
+        flap_low: float = 0.25,
+    ) -> None:
+        self.path = path
+        self.reminder_s = reminder_s
+        self.failures_to_alert = max(failures_to_alert, 1)
+        self.passes_to_resolve = max(passes_to_resolve, 1)
+        self.flap_window = max(flap_window, MIN_FLAP_SAMPLES)
+        self.flap_high = flap_high
+        self.flap_low = min(flap_low, flap_high)
+        self.states: Dict[Tuple[str, str], AlertState] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._dirty = False
+
+    def load(self) -> "AlertStateStore":
+        with self._lock:
+            self._load()
+        return self
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            for channel, tests in data.get("channels", {}).items():
+                for name, fields in tests.items():
+                    self.states[(channel, name)] = AlertState(**fields)
+        except (OSError, ValueError, TypeError) as exc:
+            log.warning("Alert state unreadable (%s); starting fresh", exc)
+            self.states = {}
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            cutoff = time.time() - STALE_AFTER_S
+            channels: Dict[str, Dict[str, Dict[str, Any]]] = {}
+            for (channel, name), state in list(self.states.items()):
+                if state.last_seen < cutoff:
+                    del self.states[(channel, name)]
+                    continue
+                channels.setdefault(channel, {})[name] = state.to_dict()
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.path.with_suffix(".tmp")
+                tmp.write_text(json.dumps({"channels": channels}), encoding="utf-8")
+                tmp.replace(self.path)
+                self._dirty = False
+            except OSError as exc:
+                log.warning("Alert state could not be written: %s", exc)
+
+    def get(self, channel: str, name: str) -> Optional[AlertState]:
+        with self._lock:
+            self._load()
+            return self.states.get((channel, name))
+
+    def decide(self, channel: str, name: str, status: str, now: Optional[float] = None) -> Optional[str]:
+        """Record one result and return the notification to send for it, if any."""
+        if status == "SKIPPED":
+            return None
+        now = time.time() if now is None else now
+        failing = status in FAILING
+        with self._lock:
+            self._load()
+            self._dirty = True
+            state = self.states.setdefault((channel, name), AlertState())
+            previous = state.history[-1:]
+            outcome = "F" if failing else "P"
+            state.streak = state.streak + 1 if previous == outcome else 1
+            state.history = (state.history + outcome)[-self.flap_window :]
+            state.last_seen = now
+
+            ratio = state.flap_ratio(self.flap_window)
+            if state.flapping:
+                if ratio > self.flap_low:
+                    return None
+                state.flapping = False
+            elif ratio >= self.flap_high:
+                state.flapping = True
+                state.last_notified = now
+                return FLAPPING
+
+            if failing:
+                if not state.alerting:
+                    if state.streak < self.failures_to_alert:
+                        return None
+                    state.alerting, state.since, state.last_notified = True, now, now
+                    return ALERT
+                if self.reminder_s and now - state.last_notified >= self.reminder_s:
+                    state.last_notified = now
+                    return REMINDER
+                return None
+            if state.alerting and state.streak >= self.passes_to_resolve:
+                state.alerting, state.last_notified = False, now
+                return RESOLVED
+            return None
+
+
+STORE = AlertStateStore(
+    Path(settings.CACHE_DIR) / "alert_state.json",
+    reminder_s=settings.ALERT_REMINDER_MINUTES * 60,
+    failures_to_alert=settings.ALERT_FAILURES_TO_ALERT,
+    passes_to_resolve=settings.ALERT_PASSES_TO_RESOLVE,
+    flap_window=settings.ALERT_FLAP_WINDOW,
+    flap_high=settings.ALERT_FLAP_THRESHOLD,
+    flap_low=settings.ALERT_FLAP_THRESHOLD / 2,
+)
@@ -0,0 +1,162 @@
+import logging
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+log = logging.getLogger("it_tester.concurrency")
+
+MODES = ("static", "aimd", "gradient")
+MAX_TRAJECTORY = 500
+# Slow start ends at the first completion with reference/observed below this (latency up 25%).
+SLOW_START_EXIT = 0.8
+
+
+class AdaptiveLimit:
+    """In-flight test limit adjusted from observed latency and errors, within bounds.
+
+    Each completion is judged as ``reference / observed`` latency. The reference is the
+    test's own timing history when there is one, else a baseline per parametrized test
+    family (both slow-rising / fast-falling), else a moving average over all other
+    tests, so slow and fast checks can be mixed.
+
+    The limit starts at ``min_limit`` and grows by one per healthy completion (slow
+    start) until latency rises noticeably or a test errors or times out. After that a
+    congestion signal is an error, a timeout or a completion slower than ``tolerance``
+    x its reference:
+
+    ``aimd``: each healthy completion adds ``1/limit`` (about +1 per round); congestion
+    cuts the limit by ``backoff``, at most once per round.
+
+    ``gradient``: once per round of ``limit`` completions the limit is scaled by the
+    average ratio (clamped to 0.5-1.0; errors count as 0.5), plus ``sqrt(limit)`` of
+    head-room while the limit is actually in use, and smoothed.
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        min_limit: int,
+        max_limit: int,
+        initial: Optional[int] = None,
+        seed: Optional[Callable[[str], Optional[float]]] = None,
+        tolerance: float = 2.0,
+        backoff: float = 0.9,
+        smoothing: float = 0.3,
+    ) -> None:
+        if mode not in ("aimd", "gradient"):
+            raise ValueError(f"Unknown adaptive concurrency mode: {mode}")
+        self.mode = mode
+        self.min_limit = max(min_limit, 1)
+        self.max_limit = max(max_limit, self.min_limit)
+        start = initial if initial is not None else self.min_limit
+        self._limit = float(min(max(start, self.min_limit), self.max_limit))
+        self.seed = seed
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+        self._baselines: Dict[str, float] = {}
+        self._average: Optional[float] = None
+        self._slow_start = True
+        self._started = time.monotonic()
+        self._trajectory: List[List[float]] = [[0.0, self.limit]]
+        self._window: List[float] = []
+        self._window_peak_inflight = 0
+        self._since_backoff = 0
+        self._samples = 0
+        self._errors = 0
+        self._peak = self.limit
+        self._area = 0.0
+        self._area_at = self._started
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def _ratio(self, name: str, family: str, duration_ms: float) -> float:
+        """reference / observed latency for this completion, then update the reference."""
+        key = name if name in self._baselines else None
+        if key is None:
+            seeded = self.seed(name) if self.seed else None
+            if seeded:
+                key, self._baselines[name] = name, seeded
+            elif family != name:
+                key = family
+        if key is None:
+            reference = self._average if self._average is not None else duration_ms
+            self._average = reference + 0.1 * (duration_ms - reference)
+        else:
+            reference = self._baselines.setdefault(key, duration_ms)
+            alpha = 0.3 if duration_ms < reference else 0.05
+            self._baselines[key] = reference + alpha * (duration_ms - reference)
+        return reference / duration_ms if duration_ms > 0 else 1.0
+
+    def observe(self, name: str, family: str, duration_ms: Optional[float], ok: bool, inflight: int) -> None:
+        with self._lock:
+            self._samples += 1
+            if not ok:
+                self._errors += 1
+            ratio = self._ratio(name, family, duration_ms) if ok and duration_ms else (0.5 if not ok else 1.0)
+            before = self.limit
+            congested = not ok or ratio < 1.0 / self.tolerance
+            if self._slow_start and ratio >= SLOW_START_EXIT:
+                if inflight * 2 >= self.limit:
+                    self._limit += 1.0
+            else:
+                self._slow_start = False
+                if self.mode == "aimd":
+                    self._aimd(congested, inflight)
+                else:
+                    self._gradient(ratio, inflight)
+            self._limit = min(max(self._limit, float(self.min_limit)), float(self.max_limit))
+            if self.limit != before:
+                self._record()
+
+    def _aimd(self, congested: bool, inflight: int) -> None:
+        self._since_backoff += 1
+        if congested:
+            if self._since_backoff >= self.limit:
+                self._limit *= self.backoff
+                self._since_backoff = 0
+        elif inflight * 2 >= self.limit:
+            self._limit += 1.0 / self._limit
+
+    def _gradient(self, ratio: float, inflight: int) -> None:
+        self._window.append(min(max(ratio, 0.5), 1.0))
+        self._window_peak_inflight = max(self._window_peak_inflight, inflight)
+        if len(self._window) < max(self.limit, 1):
+            return
+        gradient = sum(self._window) / len(self._window)
+        headroom = math.sqrt(self._limit) if self._window_peak_inflight * 2 >= self.limit else 0.0
+        target = self._limit * gradient + headroom
+        self._limit = self._limit * (1 - self.smoothing) + target * self.smoothing
+        self._window = []
+        self._window_peak_inflight = 0
+
+    def _record(self) -> None:
+        now = time.monotonic()
+        self._area += self._trajectory[-1][1] * (now - self._area_at)
+        self._area_at = now
+        self._peak = max(self._peak, self.limit)
+        self._trajectory.append([round(now - self._started, 3), self.limit])
+        if len(self._trajectory) > MAX_TRAJECTORY:
+            # Keep the first and last points, thin out the middle.
+            self._trajectory = self._trajectory[:1] + self._trajectory[1:-1:2] + self._trajectory[-1:]
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._started
+            area = self._area + self._trajectory[-1][1] * (now - self._area_at)
+            return {
+                "mode": self.mode,
+                "min": self.min_limit,
+                "max": self.max_limit,
+                "final": self.limit,
+                "peak": self._peak,
+                "mean": round(area / elapsed, 2) if elapsed > 0 else float(self.limit),
+                "samples": self._samples,
+                "errors": self._errors,
+                "trajectory": [list(point) for point in self._trajectory],
+            }
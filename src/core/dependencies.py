@@ -0,0 +1,90 @@
+import heapq
+import logging
+from typing import Dict, List, Set, Tuple
+
+from core.registry import TestCase
+from report.reporter import TestResult
+
+log = logging.getLogger("it_tester.dependencies")
+
+
+class DependencyGate:
+    """Releases cases in submission order once every test they ``depends_on`` has finished.
+
+    Dependencies refer to test names (for parametrized tests: all of their cases).
+    A dependency counts as failed unless all of its results PASSED; dependents of a
+    failed prerequisite are resolved right away as SKIPPED, transitively. Dependencies
+    that are not part of the run are ignored.
+    """
+
+    def __init__(self, cases: List[TestCase]) -> None:
+        self._ready: List[Tuple[int, TestCase]] = []
+        self._outstanding: Dict[str, int] = {}
+        self._failed: Set[str] = set()
+        self._waiting: Dict[str, int] = {}
+        self._dependents: Dict[str, List[Tuple[int, TestCase]]] = {}
+        self._blocked: Dict[str, TestCase] = {}
+
+        for case in cases:
+            self._outstanding[case.base_name] = self._outstanding.get(case.base_name, 0) + 1
+        for index, case in enumerate(cases):
+            deps = {dep for dep in case.depends_on if dep in self._outstanding and dep != case.base_name}
+            ignored = set(case.depends_on) - deps - {case.base_name}
+            if ignored:
+                log.debug("%s: dependencies not selected in this run are ignored: %s", case.name, sorted(ignored))
+            if not deps:
+                heapq.heappush(self._ready, (index, case))
+                continue
+            self._waiting[case.name] = len(deps)
+            self._blocked[case.name] = case
+            for dep in deps:
+                self._dependents.setdefault(dep, []).append((index, case))
+
+    def __bool__(self) -> bool:
+        return bool(self._ready or self._blocked)
+
+    def has_ready(self) -> bool:
+        return bool(self._ready)
+
+    def pop_ready(self) -> TestCase:
+        return heapq.heappop(self._ready)[1]
+
+    def remaining(self) -> List[TestCase]:
+        cases = [case for _, case in sorted(self._ready, key=lambda item: item[0])] + list(self._blocked.values())
+        self._ready.clear()
+        self._blocked.clear()
+        return cases
+
+    def complete(self, case: TestCase, results: List[TestResult]) -> List[TestResult]:
+        """Record a finished case; returns SKIPPED results for dependents that can no longer run."""
+        skipped: List[TestResult] = []
+        stack = [(case, any(result.status != "PASSED" for result in results) or not results)]
+        while stack:
+            current, failed = stack.pop()
+            base = current.base_name
+            if failed:
+                self._failed.add(base)
+            self._outstanding[base] -= 1
+            if self._outstanding[base] > 0:
+                continue
+            for index, dependent in self._dependents.pop(base, []):
+                if dependent.name not in self._blocked:
+                    continue
+                self._waiting[dependent.name] -= 1
+                if self._waiting[dependent.name] > 0:
+                    continue
+                del self._blocked[dependent.name]
+                failed_deps = sorted(dep for dep in dependent.depends_on if dep in self._failed)
+                if failed_deps:
+                    result = TestResult(
+                        name=dependent.name,
+                        status="SKIPPED",
+                        duration_ms=0.0,
+                        tags=dependent.tags,
+                        details="dependency failed: " + ", ".join(failed_deps),
+                    )
+                    skipped.append(result)
+                    stack.append((dependent, True))
+                else:
+                    heapq.heappush(self._ready, (index, dependent))
+        return skipped
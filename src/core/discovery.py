@@ -0,0 +1,184 @@
+import ast
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+log = logging.getLogger("it_tester.discovery")
+
+MANIFEST_VERSION = 2
+DECORATOR_NAMES = {"test", "perf"}
+REGISTRY_MODULE = "core.registry"
+
+
+def _registry_aliases(tree: ast.AST) -> Dict[str, str]:
+    """Local names bound to the registry decorators (``from core.registry import test as check``)."""
+    aliases = {name: name for name in DECORATOR_NAMES}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and node.module == REGISTRY_MODULE:
+            for alias in node.names:
+                if alias.name in DECORATOR_NAMES:
+                    aliases[alias.asname or alias.name] = alias.name
+    return aliases
+
+
+def _uses_registry(tree: ast.AST) -> bool:
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom):
+            if node.module == REGISTRY_MODULE:
+                return True
+            if node.module == "core" and any(alias.name == "registry" for alias in node.names):
+                return True
+        if isinstance(node, ast.Import) and any(alias.name == REGISTRY_MODULE for alias in node.names):
+            return True
+    return False
+
+
+def _decorator_name(node: ast.expr) -> Optional[str]:
+    target = node.func if isinstance(node, ast.Call) else node
+    if isinstance(target, ast.Name):
+        return target.id
+    if isinstance(target, ast.Attribute):
+        return target.attr
+    return None
+
+
+def _literal(node: Optional[ast.expr]) -> Any:
+    if node is None:
+        return None
+    return ast.literal_eval(node)
+
+
+def _scan_source(source: str, filename: str) -> Dict[str, Any]:
+    """Statically collect ``@test(name=..., tags=...)`` declarations of a module.
+
+    Decorators are matched by name (``@test``, ``@registry.test``) or through an aliased
+    import. A module is marked ``dynamic`` when a declaration cannot be resolved without
+    importing it (non-literal arguments, star args) or when it uses the registry but no
+    declaration was recognised; such modules are always imported.
+    """
+    tree = ast.parse(source, filename=filename)
+    aliases = _registry_aliases(tree)
+    tests: List[Dict[str, Any]] = []
+    dynamic = False
+
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        for decorator in node.decorator_list:
+            if _decorator_name(decorator) not in aliases:
+                continue
+            if not isinstance(decorator, ast.Call):
+                tests.append({"name": node.name, "tags": []})
+                continue
+            keywords = {kw.arg: kw.value for kw in decorator.keywords if kw.arg}
+            if any(kw.arg is None for kw in decorator.keywords):
+                dynamic = True
+                continue
+            positional = list(decorator.args)
+            name_node = keywords.get("name", positional[0] if positional else None)
+            tags_node = keywords.get("tags", positional[1] if len(positional) > 1 else None)
+            try:
+                name = _literal(name_node) or node.name
+                tags = _literal(tags_node) or []
+            except ValueError:
+                dynamic = True
+                continue
+            if not isinstance(name, str) or not isinstance(tags, (list, tuple)):
+                dynamic = True
+                continue
+            tests.append({"name": name, "tags": [str(tag) for tag in tags]})
+
+    if not tests and _uses_registry(tree):
+        # Registered some other way (helper wrapper, registry.register(...)): let the import tell.
+        dynamic = True
+    return {"tests": tests, "dynamic": dynamic}
+
+
+class DiscoveryManifest:
+    """On-disk cache of statically discovered tests, keyed by file mtime/size and content hash."""
+
+    def __init__(self, tests_dir: Path, cache_file: Path) -> None:
+        self.tests_dir = tests_dir
+        self.cache_file = cache_file
+        self.modules: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+
+    def _load_cache(self) -> Dict[str, Dict[str, Any]]:
+        if not self.cache_file.exists():
+            return {}
+        try:
+            data = json.loads(self.cache_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            log.warning("Discovery cache unreadable (%s); rebuilding", exc)
+            return {}
+        if data.get("version") != MANIFEST_VERSION or data.get("tests_dir") != str(self.tests_dir):
+            return {}
+        return data.get("modules", {})
+
+    def _save_cache(self) -> None:
+        payload = {"version": MANIFEST_VERSION, "tests_dir": str(self.tests_dir), "modules": self.modules}
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_file.with_suffix(".tmp")
+            tmp.write_text(json.dumps(payload), encoding="utf-8")
+            tmp.replace(self.cache_file)
+        except OSError as exc:
+            log.warning("Discovery cache could not be written: %s", exc)
+
+    def _entry_for(self, path: Path, cached: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        stat = path.stat()
+        if cached and cached.get("mtime_ns") == stat.st_mtime_ns and cached.get("size") == stat.st_size:
+            return cached
+
+        raw = path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        self._dirty = True
+        if cached and cached.get("sha256") == digest:
+            entry = dict(cached)
+        else:
+            try:
+                entry = _scan_source(raw.decode("utf-8"), str(path))
+            except (SyntaxError, UnicodeDecodeError) as exc:
+                log.warning("Static scan failed for %s (%s); module will be imported", path, exc)
+                entry = {"tests": [], "dynamic": True}
+            entry["sha256"] = digest
+        entry["mtime_ns"] = stat.st_mtime_ns
+        entry["size"] = stat.st_size
+        return entry
+
+    def build(self) -> "DiscoveryManifest":
+        cached = self._load_cache()
+        modules: Dict[str, Dict[str, Any]] = {}
+        for path in sorted(self.tests_dir.glob("*.py")):
+            if path.stem == "__init__":
+                continue
+            modules[f"tests.{path.stem}"] = self._entry_for(path, cached.get(f"tests.{path.stem}"))
+        for module_name, entry in modules.items():
+            if not entry.get("tests") and not entry.get("dynamic"):
+                log.warning("%s has no @test/@perf declarations; it is skipped when filtering by tag", module_name)
+        if set(modules) != set(cached):
+            self._dirty = True
+        self.modules = modules
+        if self._dirty:
+            self._save_cache()
+        return self
+
+    def select_modules(self, tags: List[str], exclude_tags: List[str]) -> List[str]:
+        tag_set = set(tags)
+        exclude_set = set(exclude_tags)
+        selected: List[str] = []
+        for module_name, entry in self.modules.items():
+            if entry.get("dynamic"):
+                selected.append(module_name)
+                continue
+            for item in entry.get("tests", []):
+                item_tags = set(item.get("tags", []))
+                if tag_set and not tag_set.intersection(item_tags):
+                    continue
+                if exclude_set.intersection(item_tags):
+                    continue
+                selected.append(module_name)
+                break
+        return selected
@@ -0,0 +1,250 @@
+import csv
+import json
+import logging
+from pathlib import Path
+from typing import Any, Callable, Generic, Hashable, Iterator, List, NamedTuple, Optional, Tuple, TypeVar
+
+log = logging.getLogger("it_tester.inventory")
+
+R = TypeVar("R")
+
+DB_TYPES = ("tcp", "redis", "postgres", "mysql")
+
+
+class SslEndpoint(NamedTuple):
+    host: str
+    port: int = 443
+
+    def __str__(self) -> str:
+        return f"{self.host}:{self.port}"
+
+
+class ContentCheck(NamedTuple):
+    path: str
+    keyword: str
+
+
+class DbTarget(NamedTuple):
+    name: str
+    host: str
+    port: int
+    timeout: float = 2.0
+    type: str = "tcp"
+    user: str = ""
+    database: str = ""
+
+
+def parse_host_port(entry: str, default_port: int = 443) -> Tuple[str, int]:
+    value = (entry or "").strip()
+    if not value:
+        raise ValueError("SSL endpoint entry is empty")
+    if value.startswith("https://"):
+        value = value[len("https://") :]
+    elif value.startswith("http://"):
+        value = value[len("http://") :]
+    if "/" in value:
+        value = value.split("/", 1)[0]
+    if ":" in value:
+        host, port_part = value.rsplit(":", 1)
+        try:
+            port = int(port_part)
+        except ValueError as exc:
+            raise ValueError(f"Invalid port in SSL endpoint '{entry}'") from exc
+    else:
+        host = value
+        port = default_port
+    host = host.strip()
+    if not host:
+        raise ValueError(f"Invalid SSL endpoint '{entry}'")
+    return host, port
+
+
+def build_ssl_endpoint(item: Any) -> Optional[SslEndpoint]:
+    if isinstance(item, dict):
+        entry = str(item.get("endpoint") or item.get("host") or "").strip()
+        if entry and item.get("port") not in (None, ""):
+            entry = f"{entry}:{item.get('port')}"
+    else:
+        entry = str(item).strip()
+    try:
+        host, port = parse_host_port(entry)
+    except ValueError:
+        return None
+    if port <= 0:
+        return None
+    return SslEndpoint(host, port)
+
+
+def build_content_check(item: Any) -> Optional[ContentCheck]:
+    if not isinstance(item, dict):
+        return None
+    path = str(item.get("path", "") or "").strip()
+    keyword = str(item.get("keyword", "") or "").strip()
+    if not path or not keyword:
+        return None
+    return ContentCheck(path, keyword)
+
+
+def build_db_target(item: Any) -> Optional[DbTarget]:
+    if not isinstance(item, dict):
+        return None
+    host = str(item.get("host", "") or "").strip()
+    try:
+        port = int(item.get("port", 0) or 0)
+    except (ValueError, TypeError):
+        port = 0
+    try:
+        timeout = float(item.get("timeout", 2.0) or 2.0)
+    except (ValueError, TypeError):
+        timeout = 2.0
+    kind = str(item.get("type", "tcp") or "tcp").strip().lower()
+    if not host or port <= 0 or kind not in DB_TYPES:
+        return None
+    name = str(item.get("name", host) or "").strip() or host
+    user = str(item.get("user", "") or "").strip()
+    database = str(item.get("database", "") or "").strip()
+    return DbTarget(name, host, port, timeout, kind, user, database)
+
+
+def _db_key(record: DbTarget) -> Hashable:
+    return record.host, record.port, record.type
+
+
+def _iter_env(raw: str, split_commas: bool) -> Iterator[Any]:
+    value = (raw or "").strip()
+    if not value:
+        return
+    try:
+        data = json.loads(value)
+    except json.JSONDecodeError:
+        data = None
+    if isinstance(data, list):
+        yield from data
+    elif split_commas:
+        yield from (item for item in value.split(",") if item.strip())
+
+
+def _iter_jsonl(path: Path) -> Iterator[Any]:
+    with path.open("r", encoding="utf-8") as handle:
+        for line_no, line in enumerate(handle, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as exc:
+                log.warning("%s:%s is not valid JSON (%s); skipped", path, line_no, exc)
+
+
+def _iter_csv(path: Path) -> Iterator[Any]:
+    with path.open("r", encoding="utf-8", newline="") as handle:
+        for row in csv.DictReader(handle):
+            yield {key.strip(): (value or "").strip() for key, value in row.items() if key}
+
+
+def _iter_toml(path: Path, toml_key: str) -> Iterator[Any]:
+    try:
+        import tomllib  # type: ignore
+    except ImportError:  # pragma: no cover - python < 3.11
+        try:
+            import tomli as tomllib  # type: ignore
+        except ImportError as exc:
+            raise RuntimeError(f"TOML inventory {path} requires Python 3.11+ or the 'tomli' package") from exc
+    with path.open("rb") as handle:
+        data = tomllib.load(handle)
+    items = data.get(toml_key, data.get("targets", []))
+    if isinstance(items, list):
+        yield from items
+
+
+def _iter_json(path: Path) -> Iterator[Any]:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if isinstance(data, list):
+        yield from data
+
+
+class Inventory(Generic[R]):
+    """Lazily streamed, validated and de-duplicated list of probe targets.
+
+    Targets come from an environment JSON value and/or an inventory file
+    (``.jsonl``/``.ndjson``, ``.csv``, ``.toml``, ``.json``). The file is re-read on
+    every iteration, so edits are picked up by the next run without a restart. A file
+    that cannot be read or parsed is logged and contributes no targets.
+    """
+
+    def __init__(
+        self,
+        builder: Callable[[Any], Optional[R]],
+        raw: str = "",
+        path: str = "",
+        toml_key: str = "targets",
+        split_commas: bool = False,
+        key: Optional[Callable[[R], Hashable]] = None,
+    ) -> None:
+        self.builder = builder
+        self.raw = raw
+        self.path = (path or "").strip()
+        self.toml_key = toml_key
+        self.split_commas = split_commas
+        self.key = key
+
+    def _iter_raw(self) -> Iterator[Any]:
+        yield from _iter_env(self.raw, self.split_commas)
+        if not self.path:
+            return
+        path = Path(self.path)
+        if not path.exists():
+            log.warning("Inventory file not found: %s", path)
+            return
+        suffix = path.suffix.lower()
+        try:
+            if suffix in (".jsonl", ".ndjson"):
+                yield from _iter_jsonl(path)
+            elif suffix == ".csv":
+                yield from _iter_csv(path)
+            elif suffix == ".toml":
+                yield from _iter_toml(path, self.toml_key)
+            else:
+                yield from _iter_json(path)
+        except (OSError, ValueError, RuntimeError, csv.Error) as exc:
+            # An unreadable file must not abort test expansion; its test reports as empty instead.
+            log.error("Inventory file %s could not be read (%s); its targets are skipped", path, exc)
+
+    def __iter__(self) -> Iterator[R]:
+        seen = set()
+        invalid = 0
+        for item in self._iter_raw():
+            record = self.builder(item)
+            if record is None:
+                invalid += 1
+                continue
+            marker = self.key(record) if self.key else record
+            if marker in seen:
+                continue
+            seen.add(marker)
+            yield record
+        if invalid:
+            log.warning("%s invalid inventory entries skipped (%s)", invalid, self.path or "env")
+
+    def __bool__(self) -> bool:
+        return next(iter(self), None) is not None
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def to_list(self) -> List[R]:
+        # Not list(self): its __len__ length hint would stream the whole inventory twice.
+        return [record for record in self]
+
+
+def ssl_inventory(raw: str, path: str) -> Inventory[SslEndpoint]:
+    return Inventory(build_ssl_endpoint, raw=raw, path=path, toml_key="ssl_endpoints", split_commas=True)
+
+
+def content_inventory(raw: str, path: str) -> Inventory[ContentCheck]:
+    return Inventory(build_content_check, raw=raw, path=path, toml_key="content_checks")
+
+
+def db_inventory(raw: str, path: str) -> Inventory[DbTarget]:
+    return Inventory(build_db_target, raw=raw, path=path, toml_key="db_pings", key=_db_key)
+
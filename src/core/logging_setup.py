@@ -0,0 +1,194 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Iterator, List, Optional, Tuple
+
+FORMATS = ("text", "json")
+TEXT_FORMAT = "%(asctime)s | %(levelname)s | %(message)s"
+RUN_ID_ENV = "IT_TESTER_RUN_ID"
+DEDUP_BURST = 3
+
+_TEST: ContextVar[str] = ContextVar("it_tester_log_test", default="")
+_LISTENER: Optional[QueueListener] = None
+_DEDUP: Optional["DuplicateFilter"] = None
+_CONFIG: Tuple[str, bool, float] = ("text", False, 0.0)
+
+
+def run_id() -> str:
+    """Id of this run, shared with pool worker processes through the environment."""
+    value = os.environ.get(RUN_ID_ENV)
+    if not value:
+        value = os.environ[RUN_ID_ENV] = uuid.uuid4().hex[:12]
+    return value
+
+
+@contextmanager
+def test_context(name: str) -> Iterator[None]:
+    """Attribute log records emitted by the current thread to test ``name``."""
+    token = _TEST.set(name)
+    try:
+        yield
+    finally:
+        _TEST.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """Adds ``test`` and ``run_id`` to records; runs in the emitting thread, so the test is known."""
+
+    def __init__(self, run: str) -> None:
+        super().__init__()
+        self.run = run
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.test = _TEST.get()
+        record.run_id = self.run
+        return True
+
+
+class DuplicateFilter(logging.Filter):
+    """Lets at most ``burst`` identical messages (same level and text) through per ``window`` seconds.
+
+    How many were dropped is logged when the message shows up again after the window,
+    or at shutdown.
+    """
+
+    def __init__(self, window: float, burst: int = DEDUP_BURST) -> None:
+        super().__init__()
+        self.window = window
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._seen: Dict[Tuple[int, str], List[float]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "dedup_summary", False):
+            return True
+        key = (record.levelno, record.getMessage())
+        now = time.monotonic()
+        with self._lock:
+            entry = self._seen.get(key)
+            if entry is None or now - entry[0] >= self.window:
+                suppressed = int(entry[2]) if entry else 0
+                self._seen[key] = [now, 1, 0]
+                if len(self._seen) > 10000:
+                    self._prune(now)
+            else:
+                entry[1] += 1
+                if entry[1] > self.burst:
+                    entry[2] += 1
+                    return False
+                return True
+        if suppressed:
+            self._report(record.name, record.levelno, key[1], suppressed)
+        return True
+
+    def _prune(self, now: float) -> None:
+        for key in [key for key, entry in self._seen.items() if now - entry[0] >= self.window and not entry[2]]:
+            del self._seen[key]
+
+    def _report(self, logger: str, level: int, message: str, count: int) -> None:
+        first_line = message.splitlines()[0] if message else ""
+        logging.getLogger(logger).log(
+            level,
+            "%s tekrar eden log mesajı bastırıldı: %s",
+            count,
+            first_line[:200],
+            extra={"dedup_summary": True},
+        )
+
+    def flush(self) -> None:
+        with self._lock:
+            pending = [(key, int(entry[2])) for key, entry in self._seen.items() if entry[2]]
+            self._seen.clear()
+        for (level, message), count in pending:
+            self._report("it_tester", level, message, count)
+
+
+class RawQueueHandler(QueueHandler):
+    """Enqueues records as emitted; the listener's handler formats message and traceback.
+
+    ``QueueHandler.prepare`` would merge the arguments and render ``exc_info`` in the
+    calling thread. The queue never leaves this process, so the record can travel as is
+    (log arguments must not be mutated after the call, as with any deferred handler).
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, thread, test, run id, message (and exception)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "test": getattr(record, "test", ""),
+            "run_id": getattr(record, "run_id", ""),
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def configure(fmt: str = "text", use_queue: bool = False, dedup_window: float = 0.0, level: int = logging.INFO) -> None:
+    """Replace the root handlers with the it-tester pipeline.
+
+    With ``use_queue`` worker threads only enqueue the raw records and a listener thread
+    does the formatting (including tracebacks passed as ``exc_info``) and I/O, so a
+    burst of failures does not serialise the pool on stderr.
+    """
+    global _LISTENER, _DEDUP, _CONFIG
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown log format: {fmt}")
+    shutdown()
+    _CONFIG = (fmt, use_queue, dedup_window)
+
+    stream = logging.StreamHandler()
+    stream.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+    if use_queue:
+        records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        handler: logging.Handler = RawQueueHandler(records)
+        _LISTENER = QueueListener(records, stream, respect_handler_level=True)
+        _LISTENER.start()
+    else:
+        handler = stream
+    handler.addFilter(ContextFilter(run_id()))
+    if dedup_window > 0:
+        _DEDUP = DuplicateFilter(dedup_window)
+        handler.addFilter(_DEDUP)
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+
+
+def shutdown() -> None:
+    """Report pending duplicate counts and drain the queue (also registered with atexit)."""
+    global _LISTENER, _DEDUP
+    if _DEDUP is not None:
+        dedup, _DEDUP = _DEDUP, None
+        dedup.flush()
+    if _LISTENER is not None:
+        listener, _LISTENER = _LISTENER, None
+        listener.stop()
+
+
+def config() -> Tuple[str, bool, float]:
+    """Current settings, for re-creating the pipeline inside pool worker processes."""
+    return _CONFIG
+
+
+atexit.register(shutdown)
@@ -0,0 +1,143 @@
+import functools
+import math
+import statistics
+import time
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple, Union
+
+from core.assertions import check
+from report.reporter import REPORTER, percentile
+
+Setting = Union[float, Callable[[], float]]
+Operation = Callable[..., Optional[float]]
+
+
+class PerfStats(NamedTuple):
+    cold_ms: List[float]
+    samples_ms: List[float]
+    percentile: float
+    value_ms: float
+    ci_low_ms: float
+    ci_high_ms: float
+    median_ms: float
+    p95_ms: float
+
+
+def resolve(value: Optional[Setting]) -> Optional[float]:
+    """Decorator arguments may be callables, read when the test runs (per environment profile)."""
+    return value() if callable(value) else value
+
+
+def percentile_ci(ordered: List[float], pct: float, confidence: float = 0.95) -> Tuple[float, float]:
+    """Distribution-free confidence interval of a percentile from the order statistics.
+
+    The number of samples below the true percentile is binomial(n, pct); its normal
+    approximation gives the ranks bounding the interval.
+    """
+    n = len(ordered)
+    if n == 0:
+        return 0.0, 0.0
+    q = pct / 100.0
+    z = statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+    half = z * math.sqrt(n * q * (1 - q))
+    low = min(max(int(math.floor(n * q - half)), 1), n)
+    high = min(max(int(math.ceil(n * q + half)), 1), n)
+    return ordered[low - 1], ordered[high - 1]
+
+
+def summarize(cold_ms: List[float], samples_ms: List[float], pct: float, confidence: float = 0.95) -> PerfStats:
+    ordered = sorted(samples_ms)
+    low, high = percentile_ci(ordered, pct, confidence)
+    return PerfStats(
+        cold_ms=cold_ms,
+        samples_ms=samples_ms,
+        percentile=pct,
+        value_ms=percentile(ordered, pct),
+        ci_low_ms=low,
+        ci_high_ms=high,
+        median_ms=statistics.median(ordered) if ordered else 0.0,
+        p95_ms=percentile(ordered, 95.0),
+    )
+
+
+def _timed(operation: Operation, cold: bool) -> float:
+    start = time.perf_counter()
+    measured = operation(cold=cold)
+    return float(measured) if measured is not None else (time.perf_counter() - start) * 1000
+
+
+def run(
+    operation: Operation,
+    samples: int,
+    warmup: int,
+    cold: int,
+    pct: float,
+    limit_ms: Optional[float],
+    confidence: float = 0.95,
+) -> str:
+    """Cold samples, discarded warmup calls, then ``samples`` warm ones; checks the percentile.
+
+    ``operation(cold=...)`` does one measured call and returns its latency in ms, or
+    None to have the whole call timed.
+    """
+    cold_ms = [_timed(operation, True) for _ in range(cold)]
+    for _ in range(warmup):
+        _timed(operation, False)
+    samples_ms = [_timed(operation, False) for _ in range(max(samples, 1))]
+    stats = summarize(cold_ms, samples_ms, pct, confidence)
+
+    tag = f"p{pct:g}"
+    REPORTER.record_metric(f"perf_{tag}_ms", stats.value_ms)
+    REPORTER.record_metric("perf_median_ms", stats.median_ms)
+    REPORTER.record_metric("perf_p95_ms", stats.p95_ms)
+    REPORTER.record_metric("perf_ci_low_ms", stats.ci_low_ms)
+    REPORTER.record_metric("perf_ci_high_ms", stats.ci_high_ms)
+    REPORTER.record_metric("perf_samples", float(len(samples_ms)))
+    if cold_ms:
+        REPORTER.record_metric("perf_cold_ms", statistics.median(cold_ms))
+
+    interval = f"%{confidence * 100:g} GA {stats.ci_low_ms:.2f}-{stats.ci_high_ms:.2f} ms"
+    if limit_ms:
+        check(
+            stats.value_ms < limit_ms,
+            f"{tag} {limit_ms:g} ms altında olmalı, ölçülen: {stats.value_ms:.2f} ms ({interval}, n={len(samples_ms)})",
+        )
+    summary = f"{tag}={stats.value_ms:.2f} ms ({interval})"
+    if pct != 50:
+        summary += f", median={stats.median_ms:.2f} ms"
+    if pct != 95:
+        summary += f", p95={stats.p95_ms:.2f} ms"
+    summary += f", n={len(samples_ms)}"
+    if cold_ms:
+        summary += f", cold={statistics.median(cold_ms):.2f} ms"
+    return summary
+
+
+def measure(
+    operation: Operation,
+    samples: Setting,
+    warmup: Setting,
+    cold: Setting,
+    pct: Setting,
+    limit_ms: Optional[Setting],
+    confidence: float,
+) -> Callable[..., Any]:
+    """Test function running ``operation`` through :func:`run` with settings resolved at run time.
+
+    It carries ``operation``'s name and module, so process-engine workers import the
+    module that defines the test.
+    """
+
+    @functools.wraps(operation)
+    def case(*args: Any) -> str:
+        bound = (lambda cold: operation(*args, cold=cold)) if args else operation
+        return run(
+            bound,
+            samples=int(resolve(samples) or 1),
+            warmup=int(resolve(warmup) or 0),
+            cold=int(resolve(cold) or 0),
+            pct=float(resolve(pct) or 50.0),
+            limit_ms=resolve(limit_ms),
+            confidence=confidence,
+        )
+
+    return case
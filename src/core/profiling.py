@@ -0,0 +1,251 @@
+import cProfile
+import hashlib
+import io
+import logging
+import os
+import pstats
+import random
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+log = logging.getLogger("it_tester.profiling")
+
+MODES = ("off", "cprofile", "sample")
+HOTSPOTS_FILE = "hotspots.txt"
+MEMORY_FILE = "memory.txt"
+
+
+def _slug(name: str) -> str:
+    digest = hashlib.sha1(name.encode("utf-8")).hexdigest()[:8]
+    return f"{re.sub(r'[^A-Za-z0-9_.-]+', '_', name).strip('_')[:80]}-{digest}"
+
+
+def _fold(frame: Any) -> str:
+    """Render a stack in collapsed (flamegraph/speedscope) form, root first."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class _Sampler(threading.Thread):
+    """Wall-clock stack sampler over the threads currently running a profiled test."""
+
+    def __init__(self, hz: float) -> None:
+        super().__init__(name="it-tester-sampler", daemon=True)
+        self.interval = 1.0 / max(hz, 1.0)
+        self._lock = threading.Lock()
+        self._tracked: Dict[int, Counter] = {}
+
+    def track(self, ident: int) -> None:
+        with self._lock:
+            self._tracked[ident] = Counter()
+
+    def untrack(self, ident: int) -> Counter:
+        with self._lock:
+            return self._tracked.pop(ident, Counter())
+
+    def run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._tracked:
+                    continue
+                frames = sys._current_frames()
+                for ident, stacks in self._tracked.items():
+                    frame = frames.get(ident)
+                    if frame is not None:
+                        stacks[_fold(frame)] += 1
+
+
+class RunProfiler:
+    """Per-test profiling for a run.
+
+    ``cprofile`` writes one ``.pstats`` file per profiled test; ``sample`` is a
+    low-overhead wall-clock stack sampler writing collapsed stacks (``.folded``).
+    ``rate`` is the fraction of tests profiled. Both modes merge into a top-N hotspot
+    table. On Python 3.12+ only one cProfile can be active at a time, so a test that
+    starts while another is being profiled is sampled instead (and counted).
+
+    With ``memory`` tracemalloc snapshots taken at start and finish give the
+    allocation growth. Tracing slows every allocation of the whole process, so it is
+    opt-in rather than tied to ``rate``.
+    """
+
+    def __init__(
+        self,
+        mode: str = "off",
+        rate: float = 1.0,
+        hz: float = 100.0,
+        output_dir: Optional[Path] = None,
+        top_n: int = 30,
+        memory: bool = False,
+    ) -> None:
+        if mode not in MODES:
+            raise ValueError(f"Unknown profile mode: {mode}")
+        self.mode = mode
+        self.rate = min(max(rate, 0.0), 1.0)
+        self.hz = hz
+        self.output_dir = Path(output_dir) if output_dir else Path("reports/profiles")
+        self.top_n = top_n
+        self.memory = memory
+        self._lock = threading.Lock()
+        self._sampler: Optional[_Sampler] = None
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def start(self, primary: bool = True) -> None:
+        """Prepare the output directory and start the sampler.
+
+        The primary (run-owning) process also clears stale profiles and takes the
+        baseline tracemalloc snapshot; pool worker processes only write per-test files.
+        """
+        if not self.enabled:
+            return
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        if primary:
+            for stale in self.output_dir.glob("*"):
+                if stale.suffix in (".pstats", ".folded", ".txt"):
+                    stale.unlink()
+            if self.memory:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start(1)
+                self._baseline = tracemalloc.take_snapshot()
+        if self.mode == "sample":
+            self._ensure_sampler()
+
+    def _ensure_sampler(self) -> _Sampler:
+        with self._lock:
+            if self._sampler is None:
+                self._sampler = _Sampler(self.hz)
+                self._sampler.start()
+            return self._sampler
+
+    @contextmanager
+    def profile(self, name: str) -> Iterator[None]:
+        if not self.enabled or random.random() >= self.rate:
+            yield
+            return
+        profiler: Optional[cProfile.Profile] = None
+        if self.mode == "cprofile":
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:  # python 3.12+: only one cProfile may be active at a time
+                log.debug("cProfile meşgul, %s örnekleyici ile profilleniyor", name)
+                profiler = None
+        if profiler is None:
+            sampler = self._ensure_sampler()
+            ident = threading.get_ident()
+            sampler.track(ident)
+            try:
+                yield
+            finally:
+                self._write_folded(name, sampler.untrack(ident))
+            return
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(str(self.output_dir / f"{_slug(name)}.pstats"))
+
+    def _write_folded(self, name: str, stacks: Counter) -> None:
+        if not stacks:
+            return
+        lines = [f"{stack} {count}" for stack, count in stacks.most_common()]
+        (self.output_dir / f"{_slug(name)}.folded").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    def finish(self) -> Dict[str, Any]:
+        """Merge per-test profiles into the hotspot table and write the allocation diff."""
+        if not self.enabled:
+            return {}
+        folded = sorted(self.output_dir.glob("*.folded"))
+        hotspots = self.output_dir / HOTSPOTS_FILE
+        info: Dict[str, Any] = {"mode": self.mode, "rate": self.rate}
+        if self.mode == "cprofile":
+            files = sorted(self.output_dir.glob("*.pstats"))
+            table = self._pstats_table(files)
+            if folded:
+                # Tests that overlapped another cProfile'd test (python 3.12+) were sampled.
+                table += "\n" + self._sample_table(folded)
+                log.info("Profil: %s test cProfile meşgulken örnekleyici ile profillendi", len(folded))
+            hotspots.write_text(table, encoding="utf-8")
+            info["profiled_tests"] = len(files) + len(folded)
+            info["sampled_fallback"] = len(folded)
+        else:
+            hotspots.write_text(self._sample_table(folded), encoding="utf-8")
+            info["profiled_tests"] = len(folded)
+        info["hotspots"] = str(hotspots)
+        if self._baseline is not None:
+            info.update(self._memory_report())
+        log.info("Profil: %s test profillendi, hotspot tablosu %s", info["profiled_tests"], hotspots)
+        return info
+
+    def _pstats_table(self, files: Any) -> str:
+        if not files:
+            return "no profiled tests\n"
+        buffer = io.StringIO()
+        stats = pstats.Stats(str(files[0]), stream=buffer)
+        for path in files[1:]:
+            stats.add(str(path))
+        buffer.write(f"Merged cProfile of {len(files)} test(s)\n")
+        stats.sort_stats("cumulative").print_stats(self.top_n)
+        stats.sort_stats("tottime").print_stats(self.top_n)
+        return buffer.getvalue()
+
+    def _sample_table(self, files: Any) -> str:
+        own: Counter = Counter()
+        total: Counter = Counter()
+        samples = 0
+        for path in files:
+            for line in path.read_text(encoding="utf-8").splitlines():
+                stack, _, count_text = line.rpartition(" ")
+                count = int(count_text)
+                frames = stack.split(";")
+                samples += count
+                own[frames[-1]] += count
+                for frame in set(frames):
+                    total[frame] += count
+        if not samples:
+            return "no samples collected\n"
+        lines = [f"{samples} samples from {len(files)} test(s) at {self.hz:g} Hz", f"{'own%':>7} {'total%':>7}  function"]
+        for frame, count in own.most_common(self.top_n):
+            count = total[frame]
+            lines.append(f"{100.0 * own[frame] / samples:>7.1f} {100.0 * count / samples:>7.1f}  {frame}")
+        return "\n".join(lines) + "\n"
+
+    def _memory_report(self) -> Dict[str, Any]:
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        diff = snapshot.compare_to(self._baseline, "lineno")[: self.top_n]
+        path = self.output_dir / MEMORY_FILE
+        path.write_text("\n".join(str(stat) for stat in diff) + "\n", encoding="utf-8")
+        self._baseline = None
+        return {"traced_current_mb": round(current / 1048576, 2), "traced_peak_mb": round(peak / 1048576, 2), "memory": str(path)}
+
+
+PROFILER = RunProfiler()
+
+
+def configure(mode: str, rate: float = 1.0, hz: float = 100.0, output_dir: Optional[Path] = None, memory: bool = False) -> RunProfiler:
+    global PROFILER
+    PROFILER = RunProfiler(mode, rate, hz, output_dir, memory=memory)
+    return PROFILER
+
+
+def config() -> Tuple[str, float, float, str]:
+    """Current settings, for re-creating the profiler inside pool worker processes."""
+    return PROFILER.mode, PROFILER.rate, PROFILER.hz, str(PROFILER.output_dir)
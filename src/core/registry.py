@@ -1,32 +1,136 @@
-from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List, Optional
+import functools
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+from core.perf import Setting, measure
+
+ParamSource = Union[Iterable[Any], Callable[[], Iterable[Any]]]
+ENV_TAG_PREFIX = "env:"
 
 
 @dataclass
 class TestCase:
     name: str
-    func: Callable[[], None]
+    func: Callable[[], Any]
     tags: List[str] = field(default_factory=list)
+    base_name: str = ""
+    param: Any = None
+    params: Optional[ParamSource] = None
+    ids: Optional[Callable[[Any], str]] = None
+    skip_reason: str = ""
+    empty_reason: str = ""
+    timeout: Optional[float] = None
+    depends_on: List[str] = field(default_factory=list)
+    env: str = ""
+
+    def __post_init__(self) -> None:
+        if not self.base_name:
+            self.base_name = self.name
+
+    @property
+    def parametrized(self) -> bool:
+        return self.params is not None
+
+
+def _expand(case: TestCase) -> List[TestCase]:
+    """Expand a parametrized definition into one independent case per parameter."""
+    if case.params is None:
+        return [case]
+    source = case.params() if callable(case.params) else case.params
+    id_fn = case.ids or str
+    expanded: List[TestCase] = []
+    seen: Dict[str, int] = {}
+    for param in source:
+        param_id = id_fn(param)
+        seen[param_id] = seen.get(param_id, 0) + 1
+        if seen[param_id] > 1:
+            param_id = f"{param_id}#{seen[param_id]}"
+        expanded.append(
+            TestCase(
+                name=f"{case.name}[{param_id}]",
+                func=functools.partial(case.func, param),
+                tags=case.tags,
+                base_name=case.name,
+                param=param,
+                timeout=case.timeout,
+                depends_on=case.depends_on,
+            )
+        )
+    if not expanded:
+        expanded.append(
+            TestCase(
+                name=case.name,
+                func=case.func,
+                tags=case.tags,
+                skip_reason=case.empty_reason or "No parameters configured",
+                depends_on=case.depends_on,
+            )
+        )
+    return expanded
+
+
+def for_environment(cases: List[TestCase], env: str) -> List[TestCase]:
+    """Copies of ``cases`` bound to an environment profile: ``name @env``, tagged ``env:<env>``.
+
+    Dependencies are rewritten to the same environment, so a failing prerequisite
+    only skips its dependents in that environment.
+    """
+    suffix = f" @{env}"
+    return [
+        replace(
+            case,
+            name=case.name + suffix,
+            base_name=case.base_name + suffix,
+            tags=case.tags + [ENV_TAG_PREFIX + env],
+            depends_on=[dep + suffix for dep in case.depends_on],
+            env=env,
+        )
+        for case in cases
+    ]
 
 
 class TestRegistry:
     def __init__(self) -> None:
         self._tests: Dict[str, TestCase] = {}
 
-    def register(self, name: str, func: Callable[[], None], tags: Optional[List[str]] = None) -> None:
+    def register(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        tags: Optional[List[str]] = None,
+        params: Optional[ParamSource] = None,
+        ids: Optional[Callable[[Any], str]] = None,
+        empty_reason: str = "",
+        timeout: Optional[float] = None,
+        depends_on: Optional[List[str]] = None,
+    ) -> None:
         tag_list = list(tags) if tags else []
         if name in self._tests:
             raise ValueError(f"Test name already registered: {name}")
-        self._tests[name] = TestCase(name=name, func=func, tags=tag_list)
+        self._tests[name] = TestCase(
+            name=name,
+            func=func,
+            tags=tag_list,
+            params=params,
+            ids=ids,
+            empty_reason=empty_reason,
+            timeout=timeout,
+            depends_on=list(depends_on) if depends_on else [],
+        )
 
     def all_tests(self) -> List[TestCase]:
-        return list(self._tests.values())
+        return [case for definition in self._tests.values() for case in _expand(definition)]
 
     def by_tag(self, tags: List[str]) -> List[TestCase]:
         if not tags:
             return self.all_tests()
         tag_set = set(tags)
-        return [test_case for test_case in self._tests.values() if tag_set.intersection(test_case.tags)]
+        return [
+            case
+            for definition in self._tests.values()
+            if tag_set.intersection(definition.tags)
+            for case in _expand(definition)
+        ]
 
     def exclude_tag(self, tests: List[TestCase], exclude_tags: List[str]) -> List[TestCase]:
         if not exclude_tags:
@@ -35,16 +139,91 @@ class TestRegistry:
         return [test_case for test_case in tests if not exclude_set.intersection(test_case.tags)]
 
     def list_tests(self) -> List[Dict[str, Any]]:
-        return [{"name": test_case.name, "tags": test_case.tags} for test_case in self._tests.values()]
+        return [
+            {
+                "name": test_case.name,
+                "tags": test_case.tags,
+                "parametrized": test_case.parametrized,
+                "depends_on": test_case.depends_on,
+            }
+            for test_case in self._tests.values()
+        ]
 
 
 REGISTRY = TestRegistry()
 
 
-def test(name: Optional[str] = None, tags: Optional[List[str]] = None) -> Callable[[Callable[[], None]], Callable[[], None]]:
-    def decorator(fn: Callable[[], None]) -> Callable[[], None]:
+def test(
+    name: Optional[str] = None,
+    tags: Optional[List[str]] = None,
+    params: Optional[ParamSource] = None,
+    ids: Optional[Callable[[Any], str]] = None,
+    empty_reason: str = "",
+    timeout: Optional[float] = None,
+    depends_on: Optional[List[str]] = None,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Register a test; with ``params`` it runs once per parameter as ``name[id]``.
+
+    ``params`` may be an iterable or a zero-argument callable evaluated at selection
+    time. A test function may return a string, which becomes the PASSED result details.
+    ``timeout`` (seconds) reports the case as TIMEOUT once it runs longer. Tests named
+    in ``depends_on`` run first; if any of them does not pass, this test is SKIPPED.
+    """
+
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        t_name = name if name else fn.__name__
+        REGISTRY.register(
+            t_name,
+            fn,
+            tags or [],
+            params=params,
+            ids=ids,
+            empty_reason=empty_reason,
+            timeout=timeout,
+            depends_on=depends_on,
+        )
+        return fn
+
+    return decorator
+
+
+def perf(
+    name: Optional[str] = None,
+    tags: Optional[List[str]] = None,
+    samples: Setting = 20,
+    warmup: Setting = 3,
+    cold: Setting = 1,
+    percentile: Setting = 95.0,
+    limit_ms: Optional[Setting] = None,
+    confidence: float = 0.95,
+    params: Optional[ParamSource] = None,
+    ids: Optional[Callable[[Any], str]] = None,
+    empty_reason: str = "",
+    timeout: Optional[float] = None,
+    depends_on: Optional[List[str]] = None,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Register a performance test; the function is one measured operation, ``fn(cold)``.
+
+    It is called ``cold`` times with ``cold=True`` (the test should start from a fresh
+    connection), ``warmup`` times with the results discarded, then ``samples`` times.
+    It returns its latency in ms (or None to time the whole call). The cold latency,
+    median, p95 and the chosen ``percentile`` with its ``confidence`` interval are
+    recorded as metrics; the test fails when that percentile is not below ``limit_ms``.
+    Numeric arguments may be zero-argument callables read at run time.
+    """
+
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
         t_name = name if name else fn.__name__
-        REGISTRY.register(t_name, fn, tags or [])
+        REGISTRY.register(
+            t_name,
+            measure(fn, samples, warmup, cold, percentile, limit_ms, confidence),
+            tags or [],
+            params=params,
+            ids=ids,
+            empty_reason=empty_reason,
+            timeout=timeout,
+            depends_on=depends_on,
+        )
         return fn
 
     return decorator
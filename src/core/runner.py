@@ -1,97 +1,599 @@
 import argparse
+import importlib
+import itertools
 import json
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Any
+import multiprocessing
+import os
+import time
+from contextlib import nullcontext
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, List, Dict, Any, Optional, Tuple
 
+from core import logging_setup, profiling, settings as settings_module, tracing
 from core.settings import settings
-from core.registry import REGISTRY, TestCase
+from core.registry import ENV_TAG_PREFIX, REGISTRY, TestCase, for_environment
 from core.assertions import TestAssertionError
+from core.concurrency import MODES as CONCURRENCY_MODES, AdaptiveLimit
+from core.dependencies import DependencyGate
 from core.plugins_loader import load_plugins
-from report.reporter import REPORTER, TestResult
+from core.sharding import parse_shard, select_shard
+from core.timings import TimingStore, schedule
+from core.workers import WorkerPool
+from network import http_client, rate_limit
+from report import artifacts
+from report.reporter import REPORTER, TestResult, intern_tags, latency_stats
 from plugins.base import Plugin
 
 log = logging.getLogger("it_tester.runner")
 
+RETRY_STATUSES = frozenset({"FAILED", "ERROR", "TIMEOUT"})
 
-def run_single_test(case: TestCase, plugins: List[Plugin]) -> None:
-    import time
+
+def _execute_case(case: TestCase, queued_at: Optional[float] = None) -> List[TestResult]:
     start = time.time()
-    try:
-        before_count = len(REPORTER.results)
-        case.func()
-        after_count = len(REPORTER.results)
-        if after_count == before_count:
+    if case.skip_reason:
+        return [TestResult(name=case.name, status="SKIPPED", duration_ms=0.0, tags=case.tags, details=case.skip_reason)]
+
+    attributes = {"test.name": case.name, "test.tags": ",".join(case.tags)}
+    if queued_at is not None:
+        attributes["queue_ms"] = (start - queued_at) * 1000
+    if case.env:
+        attributes["deployment.environment"] = case.env
+    # Environment-bound cases see their profile through ``settings`` and ``client``.
+    scope = settings_module.use(settings_module.profile(case.env)) if case.env else nullcontext()
+    with scope, logging_setup.test_context(case.name), tracing.TRACER.test_span(case.name, attributes) as span, REPORTER.capture() as captured:
+        try:
+            with profiling.PROFILER.profile(case.name):
+                outcome = case.func()
+            if not captured:
+                elapsed_ms = (time.time() - start) * 1000
+                captured.append(
+                    TestResult(
+                        name=case.name,
+                        status="PASSED",
+                        duration_ms=elapsed_ms,
+                        tags=case.tags,
+                        details=outcome if isinstance(outcome, str) else "",
+                    )
+                )
+        except TestAssertionError as ae:
             elapsed_ms = (time.time() - start) * 1000
-            result = TestResult(
-                name=case.name,
-                status="PASSED",
-                duration_ms=elapsed_ms,
-                tags=case.tags,
+            log.warning("[FAILED] %s: %s", case.name, ae)
+            captured.append(
+                TestResult(
+                    name=case.name,
+                    status="FAILED",
+                    duration_ms=elapsed_ms,
+                    tags=case.tags,
+                    details=str(ae),
+                )
             )
-            REPORTER.add(result)
-            for p in plugins:
-                p.on_test_result(result)
-    except TestAssertionError as ae:
-        elapsed_ms = (time.time() - start) * 1000
-        log.warning("[FAILED] %s: %s", case.name, ae)
-        result = TestResult(
-            name=case.name,
-            status="FAILED",
-            duration_ms=elapsed_ms,
-            tags=case.tags,
-            details=str(ae),
-        )
+        except Exception as e:
+            elapsed_ms = (time.time() - start) * 1000
+            import traceback
+            # The log line carries exc_info, so a queued pipeline renders it off the worker;
+            # the text here is only for the result details.
+            tb = traceback.format_exc()
+            log.error("[ERROR] %s: %s", case.name, e, exc_info=True)
+            captured.append(
+                TestResult(
+                    name=case.name,
+                    status="ERROR",
+                    duration_ms=elapsed_ms,
+                    tags=case.tags,
+                    details=f"{e}\n{tb}",
+                )
+            )
+        if case.env:
+            _label_environment(captured, case.env)
+        statuses = sorted({result.status for result in captured})
+        span.set_attribute("test.status", ",".join(statuses))
+        if statuses != ["PASSED"]:
+            span.set_error(captured[0].details.splitlines()[0] if captured and captured[0].details else ",".join(statuses))
+    return captured
+
+
+def _label_environment(results: List[TestResult], env: str) -> None:
+    """Results a test built itself (``REPORTER.add(TestResult(name=...))``) get the environment label too."""
+    suffix, tag = f" @{env}", ENV_TAG_PREFIX + env
+    for result in results:
+        if not result.name.endswith(suffix):
+            result.name += suffix
+        if tag not in result.tags:
+            result.tags = intern_tags(list(result.tags) + [tag])
+
+
+def _call_hook(plugin: Plugin, hook: str, argument: Any) -> None:
+    with tracing.TRACER.span(f"plugin {type(plugin).__name__}.{hook}", attributes={"plugin.hook": hook}):
+        getattr(plugin, hook)(argument)
+
+
+def _publish(results: List[TestResult], plugins: List[Plugin]) -> None:
+    for result in results:
         REPORTER.add(result)
         for p in plugins:
-            p.on_test_result(result)
-    except Exception as e:
-        elapsed_ms = (time.time() - start) * 1000
-        import traceback
-        tb = traceback.format_exc()
-        log.error("[ERROR] %s: %s\n%s", case.name, e, tb)
-        result = TestResult(
-            name=case.name,
-            status="ERROR",
-            duration_ms=elapsed_ms,
-            tags=case.tags,
-            details=f"{e}\n{tb}",
+            _call_hook(p, "on_test_result", result)
+
+
+def run_single_test(case: TestCase, plugins: List[Plugin]) -> List[TestResult]:
+    results = _execute_case(case)
+    _publish(results, plugins)
+    return results
+
+
+class _Running:
+    __slots__ = ("case", "queued_at", "started_at", "attempt")
+
+    def __init__(self, case: TestCase, attempt: int = 1) -> None:
+        self.case = case
+        self.queued_at = time.time()
+        self.started_at: Optional[float] = None
+        self.attempt = attempt
+
+
+def _run_tracked(state: _Running) -> List[TestResult]:
+    state.started_at = time.time()
+    return _execute_case(state.case, state.queued_at)
+
+
+def _timeout_result(case: TestCase, started_at: Optional[float], now: float, details: str) -> TestResult:
+    # A case that never started has no duration; 0 ms would teach the LPT scheduler to run it last.
+    elapsed_ms = (now - started_at) * 1000 if started_at else None
+    return TestResult(name=case.name, status="TIMEOUT", duration_ms=elapsed_ms, tags=case.tags, details=details)
+
+
+def _overrun(state: _Running, now: float, deadline: Optional[float]) -> str:
+    if deadline is not None and now >= deadline:
+        return "run deadline reached"
+    limit = state.case.timeout
+    if limit and state.started_at is not None and now - state.started_at >= limit:
+        return f"exceeded test timeout of {limit:g}s"
+    return ""
+
+
+def _next_wakeup(running: Dict[Future, _Running], deadline: Optional[float], now: float) -> Optional[float]:
+    wakeups = [deadline] if deadline is not None else []
+    for state in running.values():
+        if state.case.timeout:
+            wakeups.append((state.started_at or now) + state.case.timeout)
+    if not wakeups:
+        return None
+    return max(min(wakeups) - now, 0.0) + 0.01
+
+
+def _finish(gate: DependencyGate, case: TestCase, results: List[TestResult], on_results: Callable[[List[TestResult]], None]) -> None:
+    on_results(results)
+    skipped = gate.complete(case, results)
+    if skipped:
+        log.info("%s bağımlı test atlandı (%s başarısız)", len(skipped), case.base_name)
+        on_results(skipped)
+
+
+def _unresolved(gate: DependencyGate) -> List[TestResult]:
+    return [
+        TestResult(name=case.name, status="ERROR", duration_ms=None, tags=case.tags, details="unresolvable dependency cycle")
+        for case in gate.remaining()
+    ]
+
+
+def _run_cases(
+    cases: List[TestCase],
+    max_workers: int,
+    on_results: Callable[[List[TestResult]], None],
+    deadline: Optional[float] = None,
+    limiter: Optional[AdaptiveLimit] = None,
+    retries: int = 0,
+) -> int:
+    """Run cases on a bounded worker pool over their dependency DAG.
+
+    Per-test timeouts and the run deadline are enforced: overrunning cases are reported
+    as TIMEOUT and their workers abandoned (and replaced); whatever they produce later
+    is discarded. With a ``limiter`` the number of cases in flight follows its adaptive
+    limit (at most ``max_workers``). A case that fails, errors or times out is run again
+    up to ``retries`` times before its last results are reported (with an ``attempts``
+    metric). Returns the number of abandoned workers.
+    """
+    pool = WorkerPool(max_workers)
+    gate = DependencyGate(cases)
+    running: Dict[Future, _Running] = {}
+    abandoned = 0
+    try:
+        while gate or running:
+            while gate.has_ready() and len(running) < (limiter.limit if limiter else max_workers):
+                case = gate.pop_ready()
+                if case.skip_reason:
+                    _finish(gate, case, _execute_case(case), on_results)
+                    continue
+                state = _Running(case)
+                running[pool.submit(_run_tracked, state)] = state
+            if not running:
+                if gate and not gate.has_ready():
+                    on_results(_unresolved(gate))
+                continue
+
+            done, _ = wait(list(running), timeout=_next_wakeup(running, deadline, time.time()), return_when=FIRST_COMPLETED)
+            for future in done:
+                state = running.pop(future)
+                try:
+                    results = future.result()
+                except Exception as exc:  # pragma: no cover - _execute_case handles test errors
+                    results = [TestResult(name=state.case.name, status="ERROR", duration_ms=0.0, tags=state.case.tags, details=str(exc))]
+                if limiter:
+                    healthy = all(result.status not in ("ERROR", "TIMEOUT") for result in results)
+                    limiter.observe(state.case.name, state.case.base_name, results[0].duration_ms if results else None, healthy, len(running) + 1)
+                if _retry(state, results, retries, deadline, pool, running):
+                    continue
+                _finish(gate, state.case, _attempted(results, state.attempt), on_results)
+
+            now = time.time()
+            for future, state in list(running.items()):
+                reason = _overrun(state, now, deadline)
+                if not reason:
+                    continue
+                running.pop(future)
+                abandoned += 1
+                pool.replace_worker()
+                log.warning("[TIMEOUT] %s: %s", state.case.name, reason)
+                if limiter:
+                    limiter.observe(state.case.name, state.case.base_name, None, False, len(running) + 1)
+                results = [_timeout_result(state.case, state.started_at, now, reason)]
+                if _retry(state, results, retries, deadline, pool, running):
+                    continue
+                _finish(gate, state.case, _attempted(results, state.attempt), on_results)
+            if deadline is not None and now >= deadline and gate:
+                pending = gate.remaining()
+                log.warning("Run deadline reached; %s test not started", len(pending))
+                on_results([_timeout_result(case, None, now, "not started before run deadline") for case in pending])
+    finally:
+        pool.shutdown()
+    return abandoned
+
+
+def _environment_cases(select: Callable[[], List[TestCase]], envs: List[str]) -> List[TestCase]:
+    """Select the tests once per environment profile, interleaved so every environment progresses.
+
+    Parameters are evaluated under each profile's settings (e.g. its own SSL/DB inventory).
+    """
+    if not envs:
+        return select()
+    per_env: List[List[TestCase]] = []
+    for env in envs:
+        with settings_module.use(settings_module.profile(env)):
+            per_env.append(for_environment(select(), env))
+    return [case for group in itertools.zip_longest(*per_env) for case in group if case is not None]
+
+
+def _environment_breakdown(envs: List[str]) -> Dict[str, Dict[str, Any]]:
+    by_env: Dict[str, List[TestResult]] = {env: [] for env in envs}
+    for result in REPORTER.results:
+        for tag in result.tags:
+            if tag.startswith(ENV_TAG_PREFIX) and tag[len(ENV_TAG_PREFIX) :] in by_env:
+                by_env[tag[len(ENV_TAG_PREFIX) :]].append(result)
+    breakdown: Dict[str, Dict[str, Any]] = {}
+    for env, results in by_env.items():
+        statuses = [result.status for result in results]
+        breakdown[env] = {
+            "base_api_url": settings_module.profile(env).BASE_API_URL,
+            "total": len(results),
+            "passed": statuses.count("PASSED"),
+            "failed": statuses.count("FAILED"),
+            "error": statuses.count("ERROR"),
+            "skipped": statuses.count("SKIPPED"),
+            "timeout": statuses.count("TIMEOUT"),
+            "latency": latency_stats([result.duration_ms for result in results if result.duration_ms is not None]),
+        }
+    return breakdown
+
+
+def _retry(
+    state: _Running,
+    results: List[TestResult],
+    retries: int,
+    deadline: Optional[float],
+    pool: WorkerPool,
+    running: Dict[Future, _Running],
+) -> bool:
+    """Resubmit a failed case while it has retries left and the run deadline allows."""
+    if state.attempt > retries or not any(result.status in RETRY_STATUSES for result in results):
+        return False
+    if deadline is not None and time.time() >= deadline:
+        return False
+    log.info("[RETRY] %s (deneme %s/%s): %s", state.case.name, state.attempt + 1, retries + 1, results[0].status if results else "no result")
+    retry = _Running(state.case, state.attempt + 1)
+    running[pool.submit(_run_tracked, retry)] = retry
+    return True
+
+
+def _attempted(results: List[TestResult], attempt: int) -> List[TestResult]:
+    if attempt > 1:
+        for result in results:
+            result.metrics = {**result.metrics, "attempts": attempt}
+    return results
+
+
+def _rerun_names(previous: Dict[str, Any]) -> List[str]:
+    """Tests of a previous summary worth rerunning: failures and the dependents they skipped."""
+    return [
+        item.get("name", "")
+        for item in previous.get("results", [])
+        if item.get("status") in RETRY_STATUSES
+        or (item.get("status") == "SKIPPED" and str(item.get("details") or "").startswith("dependency failed"))
+    ]
+
+
+def _carry_over(previous: List[Dict[str, Any]]) -> int:
+    """Merge the previous run's results of tests that were not rerun, keeping the previous order."""
+    ran = {result.name for result in REPORTER.results}
+    carried = 0
+    for item in previous:
+        if item.get("name", "") in ran:
+            continue
+        REPORTER.add(
+            TestResult(
+                name=item.get("name", ""),
+                status=item.get("status", "ERROR"),
+                duration_ms=item.get("duration_ms"),
+                details=item.get("details") or "",
+                tags=list(item.get("tags") or []),
+                metrics=dict(item.get("metrics") or {}),
+            )
         )
-        REPORTER.add(result)
-        for p in plugins:
-            p.on_test_result(result)
+        carried += 1
+    order = {item.get("name", ""): index for index, item in enumerate(previous)}
+    REPORTER.results.sort(key=lambda result: order.get(result.name, len(order)))
+    return carried
+
+
+_WORKER_CASES: Dict[str, TestCase] = {}
+
+
+def _case_module(case: TestCase) -> str:
+    func = getattr(case.func, "func", case.func)
+    return getattr(func, "__module__", "")
+
+
+def _init_process_worker(
+    modules: List[str],
+    profile_config: Optional[tuple] = None,
+    trace_config: Optional[tuple] = None,
+    envs: Optional[List[str]] = None,
+    log_config: Optional[tuple] = None,
+) -> None:
+    """Pre-warm a pool process: import test modules, build the shared HTTP client, index cases."""
+    if log_config:
+        logging_setup.configure(*log_config)
+    if profile_config:
+        profiling.configure(*profile_config).start(primary=False)
+    if trace_config:
+        tracing.configure(*trace_config)
+    for module in modules:
+        importlib.import_module(module)
+    importlib.import_module("network.http_client")
+    _WORKER_CASES.clear()
+    _WORKER_CASES.update({case.name: case for case in _environment_cases(REGISTRY.all_tests, envs or [])})
+
+
+def _run_process_chunk(names: List[str], threads: int, deadline: Optional[float], retries: int = 0) -> Tuple[List[TestResult], List[Dict[str, Any]]]:
+    collected: List[TestResult] = []
+    cases: List[TestCase] = []
+    for name in names:
+        case = _WORKER_CASES.get(name)
+        if case is None:
+            collected.append(TestResult(name=name, status="ERROR", duration_ms=0.0, details="test not found in worker process"))
+        else:
+            cases.append(case)
+    _run_cases(cases, threads, collected.extend, deadline, retries=retries)
+    return collected, tracing.TRACER.drain()
+
+
+def _run_with_processes(
+    tests: List[TestCase],
+    processes: int,
+    threads: int,
+    plugins: List[Plugin],
+    deadline: Optional[float] = None,
+    retries: int = 0,
+) -> None:
+    """Distribute ready cases in chunks over a pre-warmed process pool (threads inside each worker).
+
+    Chunks are formed only from cases whose dependencies have finished, so the DAG is
+    honoured across processes; results are published in the parent as chunks complete.
+    """
+    def on_results(results: List[TestResult]) -> None:
+        _publish(results, plugins)
+
+    gate = DependencyGate(tests)
+    modules = sorted({_case_module(t) for t in tests if _case_module(t)})
+    chunk_size = max(threads, 1)
+    log.info("Process engine: %s process x %s thread", processes, threads)
+
+    executor = ProcessPoolExecutor(
+        max_workers=max(processes, 1),
+        mp_context=multiprocessing.get_context(settings.PROCESS_START_METHOD or None),
+        initializer=_init_process_worker,
+        initargs=(modules, profiling.config(), tracing.config(), sorted({t.env for t in tests if t.env}), logging_setup.config()),
+    )
+    running: Dict[Future, List[TestCase]] = {}
+    try:
+        while gate or running:
+            while gate.has_ready() and len(running) < processes * 2:
+                chunk: List[TestCase] = []
+                while gate.has_ready() and len(chunk) < chunk_size:
+                    case = gate.pop_ready()
+                    if case.skip_reason:
+                        _finish(gate, case, _execute_case(case), on_results)
+                    else:
+                        chunk.append(case)
+                if chunk:
+                    running[executor.submit(_run_process_chunk, [c.name for c in chunk], threads, deadline, retries)] = chunk
+            if not running:
+                if gate and not gate.has_ready():
+                    on_results(_unresolved(gate))
+                continue
+
+            # Workers enforce the deadline themselves; the grace period covers result transfer.
+            wait_for = None if deadline is None else max(deadline - time.time(), 0.0) + 2.0
+            done, _ = wait(list(running), timeout=wait_for, return_when=FIRST_COMPLETED)
+            if not done:
+                now = time.time()
+                for future, chunk in running.items():
+                    future.cancel()
+                    on_results([_timeout_result(case, None, now, "run deadline reached") for case in chunk])
+                running.clear()
+                on_results([_timeout_result(case, None, now, "not started before run deadline") for case in gate.remaining()])
+                break
+            for future in done:
+                chunk = running.pop(future)
+                try:
+                    results, spans = future.result()
+                    tracing.TRACER.add(spans)
+                except Exception as exc:
+                    log.error("Process worker failed: %s", exc)
+                    results = [
+                        TestResult(name=case.name, status="ERROR", duration_ms=0.0, tags=case.tags, details=f"process worker failed: {exc}")
+                        for case in chunk
+                    ]
+                by_case: Dict[str, List[TestResult]] = {}
+                for result in results:
+                    by_case.setdefault(result.name, []).append(result)
+                for case in chunk:
+                    _finish(gate, case, by_case.get(case.name, []), on_results)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
 
 
-def run_tests(tests: List[TestCase], max_workers: int, plugins: List[Plugin]) -> Dict[str, Any]:
+def run_tests(
+    tests: List[TestCase],
+    max_workers: int,
+    plugins: List[Plugin],
+    engine: str = "thread",
+    processes: Optional[int] = None,
+    schedule_strategy: str = "lpt",
+    deadline_s: Optional[float] = None,
+    artifact_format: str = "json",
+    concurrency: str = "static",
+    min_workers: int = 1,
+    retries: int = 0,
+    previous: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Run ``tests`` and write the summary.
+
+    With ``previous`` (a rerun), that summary's results for tests not run now are
+    merged into this run's summary, so it covers the whole suite.
+    """
     if not tests:
         log.warning("Çalıştırılacak test bulunamadı.")
         return {}
 
-    log.info("ENV=%s | BASE_API_URL=%s", settings.ENV, settings.BASE_API_URL)
-    log.info("%s test paralel çalıştırılıyor (max_workers=%s)...", len(tests), max_workers)
+    envs = list(dict.fromkeys(t.env for t in tests if t.env))
+    if envs:
+        for env in envs:
+            log.info("ENV profili %s | BASE_API_URL=%s", env, settings_module.profile(env).BASE_API_URL)
+    else:
+        log.info("ENV=%s | BASE_API_URL=%s", settings.ENV, settings.BASE_API_URL)
+    log.info("%s test paralel çalıştırılıyor (engine=%s, max_workers=%s)...", len(tests), engine, max_workers)
 
     if max_workers < 1:
         max_workers = 1
+    # The response memo is per run: long-lived callers (dashboard, repeated runs) must not reuse old successes.
+    http_client.reset_memos()
+    if not REPORTER.results:
+        # Earlier runs' spooled details live on inline in their summaries; without this
+        # reports/details/ would grow on every scheduled run.
+        REPORTER.details.clear()
 
     context = {
         "env": settings.ENV,
         "base_api_url": settings.BASE_API_URL,
         "test_count": len(tests),
+        "environments": envs,
+        "run_id": logging_setup.run_id(),
     }
+    REPORTER.meta["run_id"] = context["run_id"]
+    run_span = tracing.TRACER.start_run(
+        {"deployment.environment": settings.ENV, "run.engine": engine, "run.max_workers": max_workers, "run.test_count": len(tests)}
+    )
     for p in plugins:
-        p.on_start(context)
+        _call_hook(p, "on_start", context)
+    profiling.PROFILER.start()
+
+    timings = TimingStore(Path(settings.CACHE_DIR) / "timings.json").load()
+    slots = max_workers * (processes or os.cpu_count() or 1) if engine == "process" else max_workers
+    predicted_ms = None
+    if schedule_strategy == "lpt":
+        tests, predicted_ms = schedule(tests, timings, slots)
 
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {executor.submit(run_single_test, t, plugins): t for t in tests}
-        for future in as_completed(futures):
-            _ = futures[future]
+    exec_started = time.time()
+    deadline = exec_started + deadline_s if deadline_s else None
+    abandoned = 0
+    limiter = None
+    if concurrency != "static":
+        if engine == "process":
+            log.warning("Adaptif eşzamanlılık sadece thread motorunda desteklenir; sabit max_workers kullanılıyor.")
+        else:
+            limiter = AdaptiveLimit(concurrency, min_workers, max_workers, seed=timings.predict)
+    if engine == "process":
+        _run_with_processes(tests, processes or os.cpu_count() or 1, max_workers, plugins, deadline, retries)
+    else:
+        abandoned = _run_cases(tests, max_workers, lambda results: _publish(results, plugins), deadline, limiter, retries)
+    if abandoned:
+        REPORTER.meta["abandoned_workers"] = abandoned
+    if limiter:
+        REPORTER.meta["concurrency"] = limiter.summary()
+        log.info("Eşzamanlılık (%s): son=%s, tepe=%s, ortalama=%s", concurrency, limiter.limit, REPORTER.meta["concurrency"]["peak"], REPORTER.meta["concurrency"]["mean"])
+    throttled = rate_limit.LIMITER.stats()
+    if throttled:
+        # Only this process's waits: process-engine workers keep their own buckets.
+        REPORTER.meta["rate_limit"] = throttled
+    logins = http_client.auth_stats()
+    if logins:
+        # Thread engine only: process-engine workers log in (or read the disk cache) themselves.
+        REPORTER.meta["auth"] = logins
+    if envs:
+        REPORTER.meta["environments"] = _environment_breakdown(envs)
+    actual_ms = (time.time() - exec_started) * 1000
+
+    for result in REPORTER.results:
+        if result.duration_ms is not None and result.status != "SKIPPED":
+            timings.record(result.name, result.duration_ms)
+    timings.save()
+    retried = [result.name for result in REPORTER.results if "attempts" in result.metrics]
+    if retried:
+        REPORTER.meta["retried"] = {
+            "tests": len(retried),
+            "recovered": sum(1 for result in REPORTER.results if "attempts" in result.metrics and result.status == "PASSED"),
+        }
+    if previous is not None:
+        carried = _carry_over(previous.get("results", []))
+        REPORTER.meta["rerun"] = {"source": previous.get("summary_file", ""), "rerun": len(tests), "carried_over": carried}
+        log.info("Yeniden çalıştırma: %s test koşturuldu, önceki çalıştırmadan %s sonuç taşındı", len(tests), carried)
+    REPORTER.meta["schedule"] = {
+        "strategy": schedule_strategy,
+        "slots": slots,
+        "predicted_makespan_ms": predicted_ms,
+        "actual_makespan_ms": actual_ms,
+    }
+    if predicted_ms is not None:
+        log.info("Makespan: tahmin=%.1f ms, gerçekleşen=%.1f ms", predicted_ms, actual_ms)
+    if profiling.PROFILER.enabled:
+        REPORTER.meta["profile"] = profiling.PROFILER.finish()
+    if tracing.TRACER.enabled:
+        REPORTER.meta["trace"] = {
+            "trace_id": tracing.TRACER.trace_id,
+            "sample_ratio": tracing.TRACER.sample_ratio,
+            "file": str(REPORTER.output_dir / "traces.jsonl"),
+        }
 
     summary = REPORTER.summary_dict()
-    json_path = REPORTER.save_json()
+    json_path = REPORTER.save_summary(artifact_format)
     summary["summary_file"] = str(json_path)
 
     for p in plugins:
-        p.on_finish(summary)
+        _call_hook(p, "on_finish", summary)
+    run_span.end()
+    tracing.TRACER.export(REPORTER.output_dir / "traces.jsonl")
 
     return summary
 
@@ -113,29 +615,173 @@ def parse_args(argv: List[str]) -> argparse.Namespace:
     )
     parser.add_argument(
         "--format",
-        choices=["json", "junit", "html", "all"],
+        choices=["json", "junit", "html", "prom", "all"],
         default="all",
         help="Çıktı formatı (varsayılan: all)",
     )
+    parser.add_argument(
+        "--artifact-format",
+        choices=list(artifacts.FORMATS),
+        default=None,
+        help="Özet (summary) dosyası formatı: json, json.gz, json.zst (zstandard) veya msgpack (ENV/ARTIFACT_FORMAT yerine)",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        default=None,
+        help="Prometheus textfile collector çıktısı (ENV/METRICS_TEXTFILE yerine; varsayılan reports/metrics.prom)",
+    )
     parser.add_argument(
         "--max-workers",
         type=int,
         default=None,
         help="Paralel worker sayısını override et (ENV/MAX_WORKERS yerine)",
     )
+    parser.add_argument(
+        "--concurrency",
+        choices=list(CONCURRENCY_MODES),
+        default=None,
+        help="Eşzamanlılık: static (sabit --max-workers) veya gecikme/hata oranına göre aimd / gradient (üst sınır --max-workers) (ENV/CONCURRENCY yerine)",
+    )
+    parser.add_argument(
+        "--min-workers",
+        type=int,
+        default=None,
+        help="Adaptif eşzamanlılığın alt sınırı (ENV/MIN_WORKERS yerine)",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["thread", "process"],
+        default="thread",
+        help="Yürütme motoru: thread (varsayılan) veya CPU yoğun kontroller için process havuzu",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="--engine process için process sayısı (varsayılan: CPU sayısı); her process --max-workers thread kullanır",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=None,
+        help="Tüm çalıştırma için süre sınırı (saniye); aşan testler TIMEOUT raporlanır",
+    )
+    parser.add_argument(
+        "--schedule",
+        choices=["lpt", "registry"],
+        default="lpt",
+        help="Gönderim sırası: lpt (geçmiş sürelere göre en uzun test önce, varsayılan) veya registry sırası",
+    )
+    parser.add_argument(
+        "--rerun-failed",
+        action="store_true",
+        help="Sadece önceki özetteki (reports/summary.*) FAILED/ERROR/TIMEOUT testleri ve onların yüzünden atlananları çalıştır; diğer sonuçlar yeni özete taşınır",
+    )
+    parser.add_argument(
+        "--retry-failed",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Başarısız/hatalı/zaman aşımına uğrayan testleri raporlamadan önce aynı çalıştırmada N kez daha dene",
+    )
+    parser.add_argument(
+        "--env-profile",
+        action="append",
+        default=[],
+        help="Testleri bu ENV_PROFILES profiline karşı çalıştır (çoklu; 'all' hepsi). Profiller aynı worker havuzunu paylaşır, sonuçlar 'Test @profil' olarak etiketlenir",
+    )
+    parser.add_argument(
+        "--shard",
+        type=parse_shard,
+        default=None,
+        metavar="i/N",
+        help="Test kümesini N parçaya böl ve sadece i. parçayı çalıştır (test adının hash'ine göre)",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=list(profiling.MODES),
+        default=None,
+        help="Test başına profil: cprofile (pstats dosyaları) veya sample (düşük maliyetli örnekleyici); çıktı reports/profiles/ (ENV/PROFILE yerine)",
+    )
+    parser.add_argument(
+        "--profile-rate",
+        type=float,
+        default=None,
+        help="Profillenecek testlerin oranı 0-1 (ENV/PROFILE_RATE yerine; üretimde örn. 0.05)",
+    )
+    parser.add_argument(
+        "--profile-hz",
+        type=float,
+        default=100.0,
+        help="--profile sample için örnekleme frekansı (Hz)",
+    )
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        default=None,
+        help="--profile ile birlikte tracemalloc ile bellek artışını da raporla (tüm process'i yavaşlatır) (ENV/PROFILE_MEMORY yerine)",
+    )
+    parser.add_argument(
+        "--log-format",
+        choices=list(logging_setup.FORMATS),
+        default=None,
+        help="Log formatı: text veya json (satır başına bir JSON; test adı ve run_id içerir) (ENV/LOG_FORMAT yerine)",
+    )
+    parser.add_argument(
+        "--log-queue",
+        action="store_true",
+        help="Worker thread'ler log kayıtlarını kuyruğa atar, yazma işini ayrı bir dinleyici thread yapar (ENV/LOG_QUEUE)",
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Run/test/istek/plugin span'larını OTLP-JSON satırları olarak reports/traces.jsonl dosyasına yaz (örnekleme: ENV/TRACE_SAMPLE_RATIO)",
+    )
     return parser.parse_args(argv[1:])
 
 
 def main(argv: List[str]) -> int:
+    if len(argv) > 1 and argv[1] == "merge":
+        from report import merge
+
+        return merge.main(argv[2:])
+
     args = parse_args(argv)
+    logging_setup.configure(
+        args.log_format or settings.LOG_FORMAT,
+        use_queue=args.log_queue or settings.LOG_QUEUE,
+        dedup_window=settings.LOG_DEDUP_WINDOW,
+    )
 
     if args.list:
         tests_list = REGISTRY.list_tests()
         print(json.dumps({"tests": tests_list}, indent=2))
         return 0
 
-    tests = REGISTRY.by_tag(args.tag)
-    tests = REGISTRY.exclude_tag(tests, args.exclude_tag)
+    try:
+        envs = settings_module.select_profiles(args.env_profile) if args.env_profile else []
+    except (OSError, ValueError) as exc:
+        log.error("Geçersiz ortam profili: %s", exc)
+        return 2
+    tests = _environment_cases(lambda: REGISTRY.exclude_tag(REGISTRY.by_tag(args.tag), args.exclude_tag), envs)
+    if envs:
+        log.info("%s ortam profili: %s (%s test)", len(envs), ", ".join(envs), len(tests))
+    previous = None
+    if args.rerun_failed:
+        source = artifacts.find_summary(REPORTER.output_dir)
+        if source is None:
+            log.error("--rerun-failed: %s altında önceki özet bulunamadı", REPORTER.output_dir)
+            return 2
+        previous = artifacts.load_summary(source)
+        previous["summary_file"] = str(source)
+        wanted = set(_rerun_names(previous))
+        tests = [test_case for test_case in tests if test_case.name in wanted]
+        log.info("--rerun-failed: %s içinden %s test yeniden çalıştırılacak", source, len(tests))
+    if args.shard:
+        shard_index, shard_total = args.shard
+        tests = select_shard(tests, shard_index, shard_total)
+        REPORTER.meta["shard"] = f"{shard_index}/{shard_total}"
+        log.info("Shard %s/%s: %s test seçildi.", shard_index, shard_total, len(tests))
 
     max_workers = args.max_workers if args.max_workers is not None else settings.MAX_WORKERS
     if max_workers < 1:
@@ -144,7 +790,29 @@ def main(argv: List[str]) -> int:
     plugins = load_plugins()
     log.info("%s plugin yüklendi.", len(plugins))
 
-    summary = run_tests(tests, max_workers=max_workers, plugins=plugins)
+    tracing.configure(args.trace or settings.TRACE, settings.TRACE_SAMPLE_RATIO)
+    profiling.configure(
+        args.profile or settings.PROFILE,
+        rate=args.profile_rate if args.profile_rate is not None else settings.PROFILE_RATE,
+        hz=args.profile_hz,
+        output_dir=REPORTER.output_dir / "profiles",
+        memory=args.profile_memory or settings.PROFILE_MEMORY,
+    )
+
+    summary = run_tests(
+        tests,
+        max_workers=max_workers,
+        plugins=plugins,
+        engine=args.engine,
+        processes=args.processes,
+        schedule_strategy=args.schedule,
+        deadline_s=args.deadline,
+        artifact_format=args.artifact_format or settings.ARTIFACT_FORMAT,
+        concurrency=args.concurrency or settings.CONCURRENCY,
+        min_workers=args.min_workers if args.min_workers is not None else settings.MIN_WORKERS,
+        retries=max(args.retry_failed, 0),
+        previous=previous,
+    )
 
     if not summary:
         print(json.dumps({"message": "no tests to run"}, indent=2))
@@ -162,9 +830,14 @@ def main(argv: List[str]) -> int:
         html_path = REPORTER.save_html()
         output_files["html"] = str(html_path)
 
+    metrics_file = args.metrics_file or settings.METRICS_TEXTFILE
+    if args.format in ("prom", "all") or metrics_file:
+        prom_path = REPORTER.save_prometheus(metrics_file or None)
+        output_files["prom"] = str(prom_path)
+
     summary["outputs"] = output_files
 
     print(json.dumps(summary, indent=2))
 
-    failed_or_error = summary.get("failed", 0) + summary.get("error", 0)
+    failed_or_error = summary.get("failed", 0) + summary.get("error", 0) + summary.get("timeout", 0)
     return 1 if failed_or_error > 0 else 0
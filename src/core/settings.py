@@ -1,7 +1,20 @@
 import json
 import os
-from dataclasses import dataclass, field
-from typing import Any, Dict, List
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field, fields, replace
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from core.inventory import (
+    ContentCheck,
+    DbTarget,
+    Inventory,
+    SslEndpoint,
+    content_inventory,
+    db_inventory,
+    ssl_inventory,
+)
 
 
 @dataclass
@@ -11,91 +24,144 @@ class Settings:
     RETRY_COUNT: int = field(default_factory=lambda: int(os.getenv("RETRY_COUNT", "2")))
     TIMEOUT: int = field(default_factory=lambda: int(os.getenv("TIMEOUT", "5")))
     PERF_LIMIT_MS: int = field(default_factory=lambda: int(os.getenv("PERF_LIMIT_MS", "300")))
+    PERF_SAMPLES: int = field(default_factory=lambda: int(os.getenv("PERF_SAMPLES", "20")))
+    PERF_WARMUP: int = field(default_factory=lambda: int(os.getenv("PERF_WARMUP", "3")))
+    PERF_PERCENTILE: float = field(default_factory=lambda: float(os.getenv("PERF_PERCENTILE", "95")))
     ANOMALY_THRESHOLD: float = field(default_factory=lambda: float(os.getenv("ANOMALY_THRESHOLD", "1.8")))
     MAX_WORKERS: int = field(default_factory=lambda: int(os.getenv("MAX_WORKERS", "4")))
+    MIN_WORKERS: int = field(default_factory=lambda: int(os.getenv("MIN_WORKERS", "1")))
+    PROCESS_START_METHOD: str = field(default_factory=lambda: os.getenv("PROCESS_START_METHOD", ""))
+    CONCURRENCY: str = field(default_factory=lambda: os.getenv("CONCURRENCY", "static"))
     API_AUTH_TOKEN: str = field(default_factory=lambda: os.getenv("API_AUTH_TOKEN", ""))
+    AUTH_LOGIN_PATH: str = field(default_factory=lambda: os.getenv("AUTH_LOGIN_PATH", "/auth/login"))
+    AUTH_USERNAME: str = field(default_factory=lambda: os.getenv("AUTH_USERNAME", ""))
+    AUTH_PASSWORD: str = field(default_factory=lambda: os.getenv("AUTH_PASSWORD", ""))
+    AUTH_TOKEN_TTL: float = field(default_factory=lambda: float(os.getenv("AUTH_TOKEN_TTL", "300")))
+    AUTH_REFRESH_MARGIN: float = field(default_factory=lambda: float(os.getenv("AUTH_REFRESH_MARGIN", "60")))
+    AUTH_TOKEN_CACHE: bool = field(default_factory=lambda: os.getenv("AUTH_TOKEN_CACHE", "0").lower() in {"1", "true", "yes"})
     SSL_EXPIRY_THRESHOLD_DAYS: int = field(default_factory=lambda: int(os.getenv("SSL_EXPIRY_THRESHOLD_DAYS", "7")))
     SSL_ENDPOINTS_RAW: str = field(default_factory=lambda: os.getenv("SSL_ENDPOINTS", ""))
     CONTENT_CHECKS_RAW: str = field(default_factory=lambda: os.getenv("CONTENT_CHECKS", ""))
     DB_PINGS_RAW: str = field(default_factory=lambda: os.getenv("DB_PINGS", ""))
+    SSL_ENDPOINTS_FILE: str = field(default_factory=lambda: os.getenv("SSL_ENDPOINTS_FILE", ""))
+    CONTENT_CHECKS_FILE: str = field(default_factory=lambda: os.getenv("CONTENT_CHECKS_FILE", ""))
+    DB_PINGS_FILE: str = field(default_factory=lambda: os.getenv("DB_PINGS_FILE", ""))
     SLACK_WEBHOOK_URL: str = field(default_factory=lambda: os.getenv("SLACK_WEBHOOK_URL", ""))
     TELEGRAM_BOT_TOKEN: str = field(default_factory=lambda: os.getenv("TELEGRAM_BOT_TOKEN", ""))
     TELEGRAM_CHAT_ID: str = field(default_factory=lambda: os.getenv("TELEGRAM_CHAT_ID", ""))
+    ALERT_REMINDER_MINUTES: float = field(default_factory=lambda: float(os.getenv("ALERT_REMINDER_MINUTES", "60")))
+    ALERT_FAILURES_TO_ALERT: int = field(default_factory=lambda: int(os.getenv("ALERT_FAILURES_TO_ALERT", "1")))
+    ALERT_PASSES_TO_RESOLVE: int = field(default_factory=lambda: int(os.getenv("ALERT_PASSES_TO_RESOLVE", "1")))
+    ALERT_FLAP_WINDOW: int = field(default_factory=lambda: int(os.getenv("ALERT_FLAP_WINDOW", "10")))
+    ALERT_FLAP_THRESHOLD: float = field(default_factory=lambda: float(os.getenv("ALERT_FLAP_THRESHOLD", "0.5")))
+    ALERT_RUN_NOTICES: bool = field(default_factory=lambda: os.getenv("ALERT_RUN_NOTICES", "0").lower() in {"1", "true", "yes"})
+    HTTP_COALESCE: bool = field(default_factory=lambda: os.getenv("HTTP_COALESCE", "0").lower() in {"1", "true", "yes"})
+    HTTP_MEMO_TTL: float = field(default_factory=lambda: float(os.getenv("HTTP_MEMO_TTL", "30")))
+    RATE_LIMITS: str = field(default_factory=lambda: os.getenv("RATE_LIMITS", ""))
+    METRICS_TEXTFILE: str = field(default_factory=lambda: os.getenv("METRICS_TEXTFILE", ""))
+    PROFILE: str = field(default_factory=lambda: os.getenv("PROFILE", "off"))
+    PROFILE_RATE: float = field(default_factory=lambda: float(os.getenv("PROFILE_RATE", "1.0")))
+    PROFILE_MEMORY: bool = field(default_factory=lambda: os.getenv("PROFILE_MEMORY", "0").lower() in {"1", "true", "yes"})
+    TRACE: bool = field(default_factory=lambda: os.getenv("TRACE", "0").lower() in {"1", "true", "yes"})
+    TRACE_SAMPLE_RATIO: float = field(default_factory=lambda: float(os.getenv("TRACE_SAMPLE_RATIO", "1.0")))
+    DETAIL_SPOOL_BYTES: int = field(default_factory=lambda: int(os.getenv("DETAIL_SPOOL_BYTES", "4096")))
+    ARTIFACT_FORMAT: str = field(default_factory=lambda: os.getenv("ARTIFACT_FORMAT", "json"))
+    LOG_FORMAT: str = field(default_factory=lambda: os.getenv("LOG_FORMAT", "text"))
+    LOG_QUEUE: bool = field(default_factory=lambda: os.getenv("LOG_QUEUE", "0").lower() in {"1", "true", "yes"})
+    LOG_DEDUP_WINDOW: float = field(default_factory=lambda: float(os.getenv("LOG_DEDUP_WINDOW", "10")))
+    CACHE_DIR: str = field(default_factory=lambda: os.getenv("CACHE_DIR", ".it_tester_cache"))
+    ENV_PROFILES: str = field(default_factory=lambda: os.getenv("ENV_PROFILES", ""))
 
     def __post_init__(self) -> None:
         self.BASE_API_URL = self.BASE_API_URL.rstrip("/")
-        self.ssl_endpoints: List[str] = self._parse_string_list(self.SSL_ENDPOINTS_RAW)
-        self.content_checks: List[Dict[str, str]] = self._parse_content_checks(self.CONTENT_CHECKS_RAW)
-        self.db_ping_targets: List[Dict[str, Any]] = self._parse_db_targets(self.DB_PINGS_RAW)
-
-    @staticmethod
-    def _parse_string_list(raw: str) -> List[str]:
-        value = (raw or "").strip()
-        if not value:
-            return []
-        try:
-            data = json.loads(value)
-        except json.JSONDecodeError:
-            data = None
-        if isinstance(data, list):
-            return [str(item).strip() for item in data if str(item).strip()]
-        return [item.strip() for item in value.split(",") if item.strip()]
-
-    @staticmethod
-    def _parse_content_checks(raw: str) -> List[Dict[str, str]]:
-        value = (raw or "").strip()
-        if not value:
-            return []
-        try:
-            data = json.loads(value)
-        except json.JSONDecodeError:
-            return []
-        results: List[Dict[str, str]] = []
-        if isinstance(data, list):
-            for item in data:
-                if not isinstance(item, dict):
-                    continue
-                path = str(item.get("path", "")).strip()
-                keyword = str(item.get("keyword", "")).strip()
-                if path and keyword:
-                    results.append({"path": path, "keyword": keyword})
-        return results
-
-    @staticmethod
-    def _parse_db_targets(raw: str) -> List[Dict[str, Any]]:
-        value = (raw or "").strip()
-        if not value:
-            return []
-        try:
-            data = json.loads(value)
-        except json.JSONDecodeError:
-            return []
-        results: List[Dict[str, Any]] = []
-        if isinstance(data, list):
-            for item in data:
-                if not isinstance(item, dict):
-                    continue
-                host = str(item.get("host", "")).strip()
-                port_value = item.get("port", 0)
-                try:
-                    port = int(port_value)
-                except (ValueError, TypeError):
-                    port = 0
-                timeout_value = item.get("timeout", 2.0)
-                try:
-                    timeout = float(timeout_value)
-                except (ValueError, TypeError):
-                    timeout = 2.0
-                if not host or port <= 0:
-                    continue
-                name = str(item.get("name", host)).strip() or host
-                results.append({
-                    "name": name,
-                    "host": host,
-                    "port": port,
-                    "timeout": timeout,
-                })
-        return results
-
-
-settings = Settings()
+        self._build_inventories()
+
+    def _build_inventories(self) -> None:
+        self.ssl_endpoints: Inventory[SslEndpoint] = ssl_inventory(self.SSL_ENDPOINTS_RAW, self.SSL_ENDPOINTS_FILE)
+        self.content_checks: Inventory[ContentCheck] = content_inventory(self.CONTENT_CHECKS_RAW, self.CONTENT_CHECKS_FILE)
+        self.db_ping_targets: Inventory[DbTarget] = db_inventory(self.DB_PINGS_RAW, self.DB_PINGS_FILE)
+
+    def with_overrides(self, overrides: Dict[str, Any]) -> "Settings":
+        """Copy with values given by env-var name (``SSL_ENDPOINTS`` etc. map to their ``*_RAW`` fields)."""
+        known = {item.name: item for item in fields(self)}
+        changes: Dict[str, Any] = {}
+        for key, value in overrides.items():
+            name = f"{key}_RAW" if f"{key}_RAW" in known else key
+            if name not in known:
+                raise ValueError(f"unknown setting: {key}")
+            kind = known[name].type
+            if kind is bool and isinstance(value, str):
+                value = value.lower() in {"1", "true", "yes"}
+            elif kind is str and not isinstance(value, str):
+                value = json.dumps(value)
+            changes[name] = kind(value)
+        return replace(self, **changes)
+
+
+_BASE = Settings()
+_ACTIVE: ContextVar[Optional[Settings]] = ContextVar("it_tester_settings", default=None)
+_PROFILES: Optional[Dict[str, Settings]] = None
+
+
+def current() -> Settings:
+    """The settings of the environment profile the calling test runs under (else the base settings)."""
+    return _ACTIVE.get() or _BASE
+
+
+@contextmanager
+def use(profile: Settings) -> Iterator[Settings]:
+    token = _ACTIVE.set(profile)
+    try:
+        yield profile
+    finally:
+        _ACTIVE.reset(token)
+
+
+def profiles() -> Dict[str, Settings]:
+    """Environment profiles from ``ENV_PROFILES``: a JSON object or ``.json`` file path,
+    ``{"eu": {"BASE_API_URL": "https://eu.api.example.com"}, ...}``. Each profile is
+    the base settings with its overrides applied; ``ENV`` defaults to the profile name.
+    """
+    global _PROFILES
+    if _PROFILES is None:
+        raw = _BASE.ENV_PROFILES.strip()
+        if raw and not raw.startswith("{"):
+            raw = Path(raw).read_text(encoding="utf-8")
+        data = json.loads(raw) if raw else {}
+        if not isinstance(data, dict):
+            raise ValueError("ENV_PROFILES must be a JSON object of profile name -> settings")
+        _PROFILES = {str(name): _BASE.with_overrides({"ENV": str(name), **(values or {})}) for name, values in data.items()}
+    return _PROFILES
+
+
+def profile(name: str) -> Settings:
+    try:
+        return profiles()[name]
+    except KeyError:
+        raise ValueError(f"Unknown environment profile: {name}") from None
+
+
+def select_profiles(names: List[str]) -> List[str]:
+    """Validate ``--env-profile`` values; ``all`` selects every configured profile."""
+    available = profiles()
+    if "all" in names:
+        return list(available)
+    for name in names:
+        profile(name)
+    return list(dict.fromkeys(names))
+
+
+class SettingsProxy:
+    """Module-level ``settings``: forwards to the settings of the current environment profile."""
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(current(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(current(), name, value)
+
+    def __repr__(self) -> str:
+        return repr(current())
+
+
+settings: Settings = SettingsProxy()  # type: ignore[assignment]
@@ -0,0 +1,29 @@
+import argparse
+import hashlib
+from typing import List, Tuple
+
+from core.registry import TestCase
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """argparse type for ``--shard i/N`` (1-based index)."""
+    try:
+        index_part, total_part = value.split("/", 1)
+        index, total = int(index_part), int(total_part)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"shard must look like i/N, got '{value}'") from exc
+    if total < 1 or not 1 <= index <= total:
+        raise argparse.ArgumentTypeError(f"shard index must be within 1..N, got '{value}'")
+    return index, total
+
+
+def shard_of(name: str, total: int) -> int:
+    """Stable 1-based shard for a test name; independent of which other tests exist."""
+    digest = hashlib.sha1(name.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % total + 1
+
+
+def select_shard(tests: List[TestCase], index: int, total: int) -> List[TestCase]:
+    if total <= 1:
+        return tests
+    return [test_case for test_case in tests if shard_of(test_case.name, total) == index]
@@ -0,0 +1,88 @@
+import heapq
+import json
+import logging
+import statistics
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from core.registry import TestCase
+
+log = logging.getLogger("it_tester.timings")
+
+
+class TimingStore:
+    """Recent per-test durations persisted between runs, used to predict test cost."""
+
+    def __init__(self, path: Path, window: int = 5) -> None:
+        self.path = path
+        self.window = window
+        self.history: Dict[str, List[float]] = {}
+
+    def load(self) -> "TimingStore":
+        if not self.path.exists():
+            return self
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            log.warning("Timing history unreadable (%s); starting fresh", exc)
+            return self
+        self.history = {name: [float(v) for v in values] for name, values in data.get("tests", {}).items()}
+        return self
+
+    def save(self) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"tests": self.history}), encoding="utf-8")
+            tmp.replace(self.path)
+        except OSError as exc:
+            log.warning("Timing history could not be written: %s", exc)
+
+    def record(self, name: str, duration_ms: float) -> None:
+        values = self.history.setdefault(name, [])
+        values.append(duration_ms)
+        del values[: -self.window]
+
+    def predict(self, name: str) -> Optional[float]:
+        values = self.history.get(name)
+        return statistics.median(values) if values else None
+
+
+def predict_durations(tests: List[TestCase], store: TimingStore) -> Dict[str, float]:
+    """Predicted ms per case: own history, else its base test's average, else the global median."""
+    known = {t.name: store.predict(t.name) for t in tests}
+    by_base: Dict[str, List[float]] = {}
+    for name, values in store.history.items():
+        base = name.split("[", 1)[0]
+        if values:
+            by_base.setdefault(base, []).append(statistics.median(values))
+    measured = [value for value in known.values() if value is not None]
+    fallback = statistics.median(measured) if measured else 0.0
+
+    predictions: Dict[str, float] = {}
+    for test_case in tests:
+        value = known[test_case.name]
+        if value is None and test_case.base_name in by_base:
+            value = statistics.mean(by_base[test_case.base_name])
+        predictions[test_case.name] = fallback if value is None else value
+    return predictions
+
+
+def lpt_order(tests: List[TestCase], predictions: Dict[str, float]) -> List[TestCase]:
+    """Longest-processing-time-first order (stable for ties)."""
+    return sorted(tests, key=lambda t: predictions.get(t.name, 0.0), reverse=True)
+
+
+def predict_makespan(tests: List[TestCase], predictions: Dict[str, float], workers: int) -> float:
+    """Simulate greedy list scheduling of ``tests`` in the given order on ``workers`` slots."""
+    slots: List[float] = [0.0] * max(workers, 1)
+    for test_case in tests:
+        earliest = heapq.heappop(slots)
+        heapq.heappush(slots, earliest + predictions.get(test_case.name, 0.0))
+    return max(slots) if slots else 0.0
+
+
+def schedule(tests: List[TestCase], store: TimingStore, workers: int) -> Tuple[List[TestCase], float]:
+    predictions = predict_durations(tests, store)
+    ordered = lpt_order(tests, predictions)
+    return ordered, predict_makespan(ordered, predictions, workers)
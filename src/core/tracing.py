@@ -0,0 +1,233 @@
+import json
+import logging
+import os
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+log = logging.getLogger("it_tester.tracing")
+
+SERVICE_NAME = "it-tester"
+KIND_INTERNAL = 1
+KIND_CLIENT = 3
+STATUS_OK = 1
+STATUS_ERROR = 2
+EXPORT_BATCH = 512
+
+
+def _attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        encoded = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
+
+
+class Span:
+    """One timed operation; entering it makes it the current span of the thread."""
+
+    __slots__ = ("tracer", "trace_id", "span_id", "parent_id", "name", "kind", "start_ns", "end_ns", "attributes", "status", "message")
+
+    def __init__(self, tracer: "Tracer", name: str, parent_id: str, kind: int, attributes: Optional[Dict[str, Any]]) -> None:
+        thread = threading.current_thread()
+        self.tracer = tracer
+        self.trace_id = tracer.trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes: Dict[str, Any] = {"thread.id": thread.ident or 0, "thread.name": thread.name}
+        if attributes:
+            self.attributes.update(attributes)
+        self.status = 0
+        self.message = ""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_error(self, message: str) -> None:
+        self.status = STATUS_ERROR
+        self.message = message
+
+    def end(self) -> None:
+        if not self.end_ns:
+            self.end_ns = time.time_ns()
+            self.tracer._finished(self)
+
+    def __enter__(self) -> "Span":
+        self.tracer._push(self)
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.tracer._pop(self)
+        if exc is not None and self.status != STATUS_ERROR:
+            self.set_error(f"{exc_type.__name__}: {exc}")
+        self.end()
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span: Dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_attribute(key, value) for key, value in self.attributes.items() if value is not None],
+            "status": {"code": self.status, "message": self.message} if self.status == STATUS_ERROR else {"code": self.status},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+class _NoopSpan:
+    """Stand-in when tracing is off; also marks an unsampled subtree so its children are dropped."""
+
+    __slots__ = ("tracer",)
+
+    def __init__(self, tracer: Optional["Tracer"] = None) -> None:
+        self.tracer = tracer
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        return None
+
+    def set_error(self, message: str) -> None:
+        return None
+
+    def end(self) -> None:
+        return None
+
+    def __enter__(self) -> "_NoopSpan":
+        if self.tracer is not None:
+            self.tracer._push(self)
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if self.tracer is not None:
+            self.tracer._pop(self)
+
+
+_NOOP = _NoopSpan()
+
+
+class Tracer:
+    """Minimal OpenTelemetry-compatible tracer: run -> test -> request/attempt -> plugin hook.
+
+    A run is one trace. ``sample_ratio`` decides per test whether its subtree is
+    recorded; the run span and plugin hooks outside tests are always kept. Finished
+    spans are exported as OTLP/JSON lines (``ExportTraceServiceRequest`` per line),
+    which the OpenTelemetry collector file receiver and trace viewers import directly.
+    """
+
+    def __init__(self, enabled: bool = False, sample_ratio: float = 1.0, trace_id: str = "", root_id: str = "") -> None:
+        self.enabled = enabled
+        self.sample_ratio = min(max(sample_ratio, 0.0), 1.0)
+        self.trace_id = trace_id or os.urandom(16).hex()
+        self.root_id = root_id
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._spans: List[Dict[str, Any]] = []
+        self._open: Dict[str, Span] = {}
+
+    def _stack(self) -> List[Any]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _push(self, span: Any) -> None:
+        self._stack().append(span)
+
+    def _pop(self, span: Any) -> None:
+        stack = self._stack()
+        if stack and stack[-1] is span:
+            stack.pop()
+
+    def _finished(self, span: Span) -> None:
+        with self._lock:
+            self._open.pop(span.span_id, None)
+            self._spans.append(span.to_otlp())
+
+    def span(self, name: str, kind: int = KIND_INTERNAL, attributes: Optional[Dict[str, Any]] = None, sampled: bool = True) -> Any:
+        """Child of the thread's current span (or of the run span); use as a context manager."""
+        if not self.enabled:
+            return _NOOP
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        if isinstance(parent, _NoopSpan) or not sampled:
+            return _NoopSpan(self)
+        span = Span(self, name, parent.span_id if parent is not None else self.root_id, kind, attributes)
+        with self._lock:
+            self._open[span.span_id] = span
+        return span
+
+    def test_span(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> Any:
+        return self.span(f"test {name}", attributes=attributes, sampled=random.random() < self.sample_ratio)
+
+    def start_run(self, attributes: Optional[Dict[str, Any]] = None) -> Any:
+        if not self.enabled:
+            return _NOOP
+        run = Span(self, "run", "", KIND_INTERNAL, attributes)
+        self.root_id = run.span_id
+        with self._lock:
+            self._open[run.span_id] = run
+        return run
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """Take the finished spans (pool workers send them back to the parent)."""
+        with self._lock:
+            spans, self._spans = self._spans, []
+        return spans
+
+    def add(self, spans: List[Dict[str, Any]]) -> None:
+        if spans:
+            with self._lock:
+                self._spans.extend(spans)
+
+    def export(self, path: Path) -> int:
+        """Close still-open spans (abandoned tests) and write the run's spans to ``path``."""
+        if not self.enabled:
+            return 0
+        with self._lock:
+            still_open = list(self._open.values())
+        for span in still_open:
+            span.set_error("span not finished (test abandoned)")
+            span.end()
+        spans = self.drain()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        resource = {"attributes": [_attribute("service.name", SERVICE_NAME), _attribute("process.pid", os.getpid())]}
+        with path.open("w", encoding="utf-8") as handle:
+            for offset in range(0, len(spans), EXPORT_BATCH):
+                batch = {
+                    "resourceSpans": [
+                        {
+                            "resource": resource,
+                            "scopeSpans": [{"scope": {"name": "it_tester"}, "spans": spans[offset : offset + EXPORT_BATCH]}],
+                        }
+                    ]
+                }
+                handle.write(json.dumps(batch, separators=(",", ":")) + "\n")
+        log.info("%s span %s dosyasına yazıldı (trace_id=%s)", len(spans), path, self.trace_id)
+        return len(spans)
+
+
+TRACER = Tracer()
+
+
+def configure(enabled: bool, sample_ratio: float = 1.0, trace_id: str = "", root_id: str = "") -> Tracer:
+    global TRACER
+    TRACER = Tracer(enabled, sample_ratio, trace_id, root_id)
+    return TRACER
+
+
+def config() -> Tuple[bool, float, str, str]:
+    """Current settings, for continuing the trace inside pool worker processes."""
+    return TRACER.enabled, TRACER.sample_ratio, TRACER.trace_id, TRACER.root_id
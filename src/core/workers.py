@@ -0,0 +1,53 @@
+import itertools
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Optional, Tuple
+
+_COUNTER = itertools.count(1)
+
+
+class WorkerPool:
+    """Minimal daemon-thread pool.
+
+    Unlike ``ThreadPoolExecutor``, its threads never block interpreter exit, and a
+    worker stuck in a test can be written off with ``replace_worker`` so the pool
+    keeps its capacity. Abandoned threads finish (or die with the process) on their own.
+    """
+
+    def __init__(self, size: int, name: str = "it-tester-worker") -> None:
+        self.name = name
+        self._tasks: "queue.Queue[Optional[Tuple[Callable[..., Any], tuple, Future]]]" = queue.Queue()
+        self._threads = 0
+        for _ in range(max(size, 1)):
+            self._spawn()
+
+    def _spawn(self) -> None:
+        thread = threading.Thread(target=self._work, name=f"{self.name}-{next(_COUNTER)}", daemon=True)
+        self._threads += 1
+        thread.start()
+
+    def _work(self) -> None:
+        while True:
+            item = self._tasks.get()
+            if item is None:
+                return
+            fn, args, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args))
+            except BaseException as exc:  # noqa: BLE001 - delivered through the future
+                future.set_exception(exc)
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        future: Future = Future()
+        self._tasks.put((fn, args, future))
+        return future
+
+    def replace_worker(self) -> None:
+        self._spawn()
+
+    def shutdown(self) -> None:
+        for _ in range(self._threads):
+            self._tasks.put(None)
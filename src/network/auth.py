@@ -0,0 +1,168 @@
+import base64
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+log = logging.getLogger("it_tester.auth")
+
+TOKEN_FIELDS = ("token", "access_token")
+
+
+class AuthError(RuntimeError):
+    """Login did not produce a usable token."""
+
+
+class CachedToken(NamedTuple):
+    value: str
+    expires_at: float
+    refresh_at: float
+
+
+def jwt_expiry(token: str) -> Optional[float]:
+    """``exp`` claim of a JWT (epoch seconds), without verifying the signature."""
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+    try:
+        claims = json.loads(base64.urlsafe_b64decode(parts[1] + "=" * (-len(parts[1]) % 4)))
+    except ValueError:
+        return None
+    exp = claims.get("exp") if isinstance(claims, dict) else None
+    return float(exp) if isinstance(exp, (int, float)) and not isinstance(exp, bool) else None
+
+
+class TokenProvider:
+    """Logs in once and hands out the cached bearer token until it is close to expiry.
+
+    ``login`` performs the login request and returns the decoded JSON body; the token is
+    its ``token`` / ``access_token`` field and expires after ``expires_in`` seconds, at
+    the JWT ``exp`` claim, or after ``default_ttl``. It is refreshed ``refresh_margin``
+    seconds early (at most half its lifetime). Concurrent callers needing a refresh wait
+    for a single login. With ``cache_path`` tokens are also kept on disk (mode 0600),
+    keyed by ``key``, so later runs and pool processes skip the login too.
+    """
+
+    def __init__(
+        self,
+        login: Callable[[], Dict[str, Any]],
+        key: str = "default",
+        cache_path: Optional[Path] = None,
+        default_ttl: float = 300.0,
+        refresh_margin: float = 60.0,
+    ) -> None:
+        self.login = login
+        self.key = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+        self.cache_path = cache_path
+        self.default_ttl = default_ttl
+        self.refresh_margin = refresh_margin
+        self._token: Optional[CachedToken] = None
+        self._refresh_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {"logins": 0, "cache_hits": 0, "disk_hits": 0, "rejected": 0}
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def token(self) -> str:
+        cached = self._token
+        if cached is not None and time.time() < cached.refresh_at:
+            self._count("cache_hits")
+            return cached.value
+        with self._refresh_lock:
+            # Whoever held the lock before us may already have refreshed it.
+            cached = self._token
+            if cached is not None and time.time() < cached.refresh_at:
+                self._count("cache_hits")
+                return cached.value
+            cached = self._load()
+            if cached is not None:
+                self._count("disk_hits")
+            else:
+                cached = self._login()
+                self._save(cached)
+            self._token = cached
+            return cached.value
+
+    def seed(self, payload: Dict[str, Any]) -> None:
+        """Adopt the result of a login done elsewhere (e.g. by the login check itself)."""
+        cached = self._parse(payload)
+        with self._refresh_lock:
+            self._token = cached
+            self._save(cached)
+
+    def invalidate(self, value: str) -> None:
+        """Drop ``value`` after the server rejected it; a newer token is kept."""
+        with self._refresh_lock:
+            if self._token is not None and self._token.value == value:
+                self._count("rejected")
+                self._token = None
+                self._save(None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def _login(self) -> CachedToken:
+        log.info("Auth: logging in for a new token")
+        self._count("logins")
+        return self._parse(self.login())
+
+    def _parse(self, payload: Dict[str, Any]) -> CachedToken:
+        value = next((payload[name] for name in TOKEN_FIELDS if isinstance(payload.get(name), str)), "")
+        if not value:
+            raise AuthError(f"Login response has no token field ({', '.join(TOKEN_FIELDS)})")
+        now = time.time()
+        expires_in = payload.get("expires_in")
+        if isinstance(expires_in, (int, float)) and not isinstance(expires_in, bool) and expires_in > 0:
+            expires_at = now + float(expires_in)
+        else:
+            expires_at = jwt_expiry(value) or now + self.default_ttl
+        refresh_at = expires_at - min(self.refresh_margin, max(expires_at - now, 0.0) / 2)
+        return CachedToken(value, expires_at, refresh_at)
+
+    def _read(self) -> Dict[str, Any]:
+        if self.cache_path is None or not self.cache_path.exists():
+            return {}
+        try:
+            data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError) as exc:
+            log.warning("Auth token cache unreadable (%s); ignoring it", exc)
+            return {}
+
+    def _load(self) -> Optional[CachedToken]:
+        entry = self._read().get(self.key)
+        try:
+            cached = CachedToken(*entry) if entry else None
+        except TypeError:
+            return None
+        if cached is None or time.time() >= cached.refresh_at:
+            return None
+        return cached
+
+    def _save(self, cached: Optional[CachedToken]) -> None:
+        if self.cache_path is None:
+            return
+        data = self._read()
+        now = time.time()
+        data = {key: entry for key, entry in data.items() if isinstance(entry, list) and len(entry) == 3 and entry[1] > now}
+        if cached is None:
+            data.pop(self.key, None)
+        else:
+            data[self.key] = list(cached)
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_path.with_suffix(".tmp")
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                os.chmod(tmp, 0o600)
+                json.dump(data, handle)
+            tmp.replace(self.cache_path)
+        except OSError as exc:
+            log.warning("Auth token cache could not be written: %s", exc)
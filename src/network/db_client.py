@@ -1,15 +1,333 @@
+import logging
 import socket
-from typing import Dict, Tuple
+import ssl
+import struct
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple, Union
 
+from core.inventory import DbTarget, build_db_target
+from network.rate_limit import LIMITER
 
-def tcp_ping(target: Dict[str, object]) -> Tuple[bool, str]:
-    host = str(target.get("host", "")).strip()
-    port = int(target.get("port", 0))
-    timeout = float(target.get("timeout", 2.0))
-    if not host or port <= 0:
-        return False, "invalid host or port"
+log = logging.getLogger("it_tester.db")
+
+POSTGRES_SSL_REQUEST = struct.pack("!ii", 8, 80877103)
+POSTGRES_PROTOCOL_3 = 196608
+POSTGRES_DEFAULT_USER = "it_tester"
+# SQLSTATEs meaning the server is up but not accepting this connection (starting, shutting down, full).
+POSTGRES_UNAVAILABLE = {"57P01", "57P02", "57P03", "53300"}
+# MySQL error codes in the greeting: too many connections, host blocked / not allowed.
+MYSQL_UNAVAILABLE = {1040, 1129, 1130}
+MYSQL_CLIENT_CONNECT_WITH_DB = 0x8
+MYSQL_CLIENT_PROTOCOL_41 = 0x200
+MYSQL_CLIENT_SECURE_CONNECTION = 0x8000
+MYSQL_CLIENT_PLUGIN_AUTH = 0x80000
+MYSQL_COM_QUIT = b"\x01"
+MAX_PACKET = 1 << 16
+
+Address = Tuple[str, int]
+
+
+class DbProbe(NamedTuple):
+    ok: bool
+    message: str
+    metrics: Dict[str, float]
+
+
+class ConnectionPool:
+    """Idle probe connections per (host, port), reused by later probes in the same process.
+
+    A CLI run probes each target once (the inventory de-duplicates them), so this
+    only pays off for long-lived callers that probe the same targets repeatedly.
+
+    Connections idle for longer than ``idle_s`` are closed instead of reused; at most
+    ``max_idle`` are kept per target.
+    """
+
+    def __init__(self, max_idle: int = 4, idle_s: float = 60.0) -> None:
+        self.max_idle = max_idle
+        self.idle_s = idle_s
+        self._lock = threading.Lock()
+        self._idle: Dict[Address, List[Tuple[float, socket.socket]]] = {}
+
+    def get(self, address: Address) -> Optional[socket.socket]:
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get(address, [])
+            while idle:
+                released, sock = idle.pop()
+                if now - released < self.idle_s:
+                    return sock
+                sock.close()
+        return None
+
+    def put(self, address: Address, sock: socket.socket) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(address, [])
+            if len(idle) < self.max_idle:
+                idle.append((time.monotonic(), sock))
+                return
+        sock.close()
+
+    def clear(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for _, sock in connections:
+                sock.close()
+
+
+POOL = ConnectionPool()
+
+
+def _ms(start: float) -> float:
+    return (time.perf_counter() - start) * 1000
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("connection closed by server")
+        data += chunk
+    return data
+
+
+def _recv_line(sock: socket.socket, limit: int = 512) -> bytes:
+    data = b""
+    while not data.endswith(b"\r\n"):
+        chunk = sock.recv(1)
+        if not chunk:
+            raise ConnectionError("connection closed by server")
+        data += chunk
+        if len(data) > limit:
+            raise ValueError("reply line too long")
+    return data[:-2]
+
+
+def _connect(record: DbTarget, metrics: Dict[str, float]) -> socket.socket:
+    start = time.perf_counter()
+    sock = socket.create_connection((record.host, record.port), timeout=record.timeout)
+    metrics["db_connect_ms"] = _ms(start)
+    return sock
+
+
+def _tcp(record: DbTarget, metrics: Dict[str, float]) -> DbProbe:
+    _connect(record, metrics).close()
+    return DbProbe(True, "connection successful", metrics)
+
+
+def _redis_ping(sock: socket.socket) -> Tuple[bytes, float]:
+    start = time.perf_counter()
+    sock.sendall(b"*1\r\n$4\r\nPING\r\n")
+    return _recv_line(sock), _ms(start)
+
+
+def _redis(record: DbTarget, metrics: Dict[str, float]) -> DbProbe:
+    """``PING`` over a pooled connection; a fresh connection's first PING is the handshake."""
+    address = (record.host, record.port)
+    sock = POOL.get(address)
+    pooled = sock is not None
+    reply = b""
+    if sock is not None:
+        try:
+            reply, metrics["db_rtt_ms"] = _redis_ping(sock)
+        except OSError as exc:
+            log.debug("Pooled Redis connection to %s:%s lost (%s); reconnecting", record.host, record.port, exc)
+            sock.close()
+            sock, pooled = None, False
+    if sock is None:
+        sock = _connect(record, metrics)
+        try:
+            _, metrics["db_handshake_ms"] = _redis_ping(sock)
+            reply, metrics["db_rtt_ms"] = _redis_ping(sock)
+        except BaseException:
+            sock.close()
+            raise
+    if reply[:1] not in (b"+", b"-"):
+        sock.close()
+        return DbProbe(False, f"unexpected Redis reply: {reply[:60]!r}", metrics)
+    POOL.put(address, sock)
+    suffix = " (pooled connection)" if pooled else ""
+    if reply == b"+PONG":
+        return DbProbe(True, f"PONG{suffix}", metrics)
+    if reply.startswith((b"-NOAUTH", b"-WRONGPASS")):
+        return DbProbe(True, f"Redis answered, authentication required{suffix}", metrics)
+    return DbProbe(False, f"Redis error: {reply[1:].decode('utf-8', 'replace')}", metrics)
+
+
+def _postgres_startup(record: DbTarget) -> bytes:
+    params = [b"user", (record.user or POSTGRES_DEFAULT_USER).encode("utf-8")]
+    if record.database:
+        params += [b"database", record.database.encode("utf-8")]
+    body = struct.pack("!i", POSTGRES_PROTOCOL_3) + b"".join(value + b"\0" for value in params) + b"\0"
+    return struct.pack("!i", len(body) + 4) + body
+
+
+def _postgres_error(body: bytes) -> Tuple[str, str]:
+    fields = {chunk[:1]: chunk[1:].decode("utf-8", "replace") for chunk in body.split(b"\0") if chunk}
+    return fields.get(b"C", ""), fields.get(b"M", "")
+
+
+def _postgres(record: DbTarget, metrics: Dict[str, float]) -> DbProbe:
+    """SSLRequest (and TLS if offered), then a startup message up to the server's auth request."""
+    sock = _connect(record, metrics)
     try:
-        with socket.create_connection((host, port), timeout=timeout):
-            return True, "connection successful"
-    except Exception as exc:
-        return False, f"connection failed: {exc}"
+        start = time.perf_counter()
+        sock.sendall(POSTGRES_SSL_REQUEST)
+        answer = _recv_exactly(sock, 1)
+        if answer == b"S":
+            # Only proving the server speaks TLS here; certificates are the SSL checks' job.
+            context = ssl.create_default_context()
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+            sock = context.wrap_socket(sock, server_hostname=record.host)
+        elif answer != b"N":
+            return DbProbe(False, f"unexpected reply to SSLRequest: {answer!r}", metrics)
+        metrics["db_handshake_ms"] = _ms(start)
+
+        start = time.perf_counter()
+        sock.sendall(_postgres_startup(record))
+        kind = _recv_exactly(sock, 1)
+        length = struct.unpack("!i", _recv_exactly(sock, 4))[0]
+        metrics["db_rtt_ms"] = _ms(start)
+        body = _recv_exactly(sock, min(max(length - 4, 0), MAX_PACKET))
+    finally:
+        sock.close()
+    tls = "TLS" if answer == b"S" else "no TLS"
+    if kind == b"R":
+        code = struct.unpack("!i", body[:4])[0] if len(body) >= 4 else -1
+        return DbProbe(True, f"Postgres answered ({tls}, auth request {code})", metrics)
+    if kind == b"E":
+        sqlstate, message = _postgres_error(body)
+        if sqlstate in POSTGRES_UNAVAILABLE:
+            return DbProbe(False, f"Postgres refused connection: {sqlstate} {message}", metrics)
+        return DbProbe(True, f"Postgres answered ({tls}): {sqlstate} {message}", metrics)
+    return DbProbe(False, f"unexpected Postgres message type {kind!r}", metrics)
+
+
+def _mysql_packet(sock: socket.socket) -> Tuple[int, bytes]:
+    header = _recv_exactly(sock, 4)
+    length = int.from_bytes(header[:3], "little")
+    return header[3], _recv_exactly(sock, min(length, MAX_PACKET))
+
+
+def _mysql_send(sock: socket.socket, sequence: int, payload: bytes) -> None:
+    sock.sendall(len(payload).to_bytes(3, "little") + bytes([sequence & 0xFF]) + payload)
+
+
+def _mysql_error(payload: bytes) -> Tuple[int, str]:
+    code = int.from_bytes(payload[1:3], "little")
+    message = payload[3:].decode("utf-8", "replace")
+    if message.startswith("#"):
+        message = message[6:]  # "#" + five character SQLSTATE
+    return code, message
+
+
+def _mysql_capabilities(greeting: bytes) -> int:
+    """Server capability flags from a protocol 10 greeting (0 if it is too short to tell)."""
+    offset = greeting.find(b"\0", 1) + 1 + 4 + 8 + 1  # version, thread id, auth data part 1, filler
+    if offset <= 0 or len(greeting) < offset + 7:
+        return 0
+    lower = int.from_bytes(greeting[offset : offset + 2], "little")
+    upper = int.from_bytes(greeting[offset + 5 : offset + 7], "little")
+    return lower | upper << 16
+
+
+def _mysql_login(record: DbTarget, server_caps: int) -> bytes:
+    """HandshakeResponse41 with an empty password, as a password-less monitoring user."""
+    caps = MYSQL_CLIENT_PROTOCOL_41 | MYSQL_CLIENT_SECURE_CONNECTION | (server_caps & MYSQL_CLIENT_PLUGIN_AUTH)
+    if record.database:
+        caps |= MYSQL_CLIENT_CONNECT_WITH_DB
+    payload = struct.pack("<IIB", caps, 1 << 24, 33) + b"\0" * 23
+    payload += record.user.encode("utf-8") + b"\0" + b"\0"  # user, empty auth response
+    if record.database:
+        payload += record.database.encode("utf-8") + b"\0"
+    if caps & MYSQL_CLIENT_PLUGIN_AUTH:
+        payload += b"mysql_native_password\0"
+    return payload
+
+
+def _mysql(record: DbTarget, metrics: Dict[str, float]) -> DbProbe:
+    """Read the server greeting (protocol 10) or the error packet sent instead of it.
+
+    Without ``user`` the connection is dropped after the greeting, which MySQL counts
+    as a connect error towards ``max_connect_errors`` (eventually blocking this host
+    with error 1129). With ``user`` the handshake is completed as that password-less
+    user and closed with ``COM_QUIT``; the login round trip is ``db_rtt_ms``.
+    """
+    sock = _connect(record, metrics)
+    reply = b""
+    try:
+        start = time.perf_counter()
+        _, payload = _mysql_packet(sock)
+        metrics["db_handshake_ms"] = _ms(start)
+        caps = _mysql_capabilities(payload) if payload[:1] == b"\x0a" else 0
+        if record.user and caps & MYSQL_CLIENT_PROTOCOL_41:
+            start = time.perf_counter()
+            _mysql_send(sock, 1, _mysql_login(record, caps))
+            sequence, reply = _mysql_packet(sock)
+            if reply[:1] == b"\xfe":
+                # Auth method switch: answer with the (empty) password for the requested plugin.
+                _mysql_send(sock, sequence + 1, b"")
+                sequence, reply = _mysql_packet(sock)
+            metrics["db_rtt_ms"] = _ms(start)
+            if reply[:1] == b"\x00":
+                _mysql_send(sock, 0, MYSQL_COM_QUIT)
+    finally:
+        sock.close()
+    if payload[:1] == b"\x0a":
+        version = payload[1 : payload.find(b"\0", 1)].decode("utf-8", "replace")
+        if reply[:1] == b"\x00":
+            return DbProbe(True, f"MySQL {version}, logged in as {record.user}", metrics)
+        if reply[:1] == b"\xff":
+            code, message = _mysql_error(reply)
+            if code in MYSQL_UNAVAILABLE:
+                return DbProbe(False, f"MySQL {version} refused login: {code} {message}", metrics)
+            return DbProbe(True, f"MySQL {version} answered login: {code} {message}", metrics)
+        if reply:
+            return DbProbe(True, f"MySQL {version} greeting (login needs more than an empty password)", metrics)
+        return DbProbe(True, f"MySQL {version} greeting", metrics)
+    if payload[:1] == b"\xff":
+        code, message = _mysql_error(payload)
+        if code in MYSQL_UNAVAILABLE:
+            return DbProbe(False, f"MySQL refused connection: {code} {message}", metrics)
+        return DbProbe(True, f"MySQL answered: {code} {message}", metrics)
+    return DbProbe(False, f"unexpected MySQL greeting (protocol {payload[:1]!r})", metrics)
+
+
+PROBES: Dict[str, Callable[[DbTarget, Dict[str, float]], DbProbe]] = {
+    "tcp": _tcp,
+    "redis": _redis,
+    "postgres": _postgres,
+    "mysql": _mysql,
+}
+
+
+def probe(target: Union[DbTarget, Dict[str, object]]) -> DbProbe:
+    """Protocol-aware probe chosen by the target ``type``; metrics exclude rate-limit waits.
+
+    Metrics: ``db_connect_ms`` (TCP connect of a new connection), ``db_handshake_ms``
+    (Redis first PING, Postgres SSLRequest/TLS, MySQL greeting) and ``db_rtt_ms``
+    (Redis PING, Postgres startup -> auth request, MySQL login with ``user``).
+    """
+    record = target if isinstance(target, DbTarget) else build_db_target(target)
+    if record is None:
+        return DbProbe(False, "invalid host, port or type", {})
+    LIMITER.acquire(record.host, record.port)
+    metrics: Dict[str, float] = {}
+    try:
+        return PROBES[record.type](record, metrics)
+    except (OSError, ValueError, struct.error) as exc:
+        if "db_connect_ms" not in metrics:
+            return DbProbe(False, f"connection failed: {exc}", metrics)
+        return DbProbe(False, f"{record.type} handshake failed: {exc}", metrics)
+
+
+def tcp_ping(target: Union[DbTarget, Dict[str, object]]) -> Tuple[bool, str]:
+    record = target if isinstance(target, DbTarget) else build_db_target(target)
+    if record is None:
+        return False, "invalid host or port"
+    result = probe(record._replace(type="tcp"))
+    return result.ok, result.message
@@ -3,35 +3,18 @@ import socket
 import ssl
 from typing import Tuple
 
+from core.inventory import parse_host_port
+from network.rate_limit import LIMITER
+
 
 def _parse_host(entry: str) -> Tuple[str, int]:
-    value = (entry or "").strip()
-    if not value:
-        raise ValueError("SSL endpoint entry is empty")
-    if value.startswith("https://"):
-        value = value[len("https://") :]
-    elif value.startswith("http://"):
-        value = value[len("http://") :]
-    if "/" in value:
-        value = value.split("/", 1)[0]
-    if ":" in value:
-        host, port_part = value.rsplit(":", 1)
-        try:
-            port = int(port_part)
-        except ValueError as exc:  # pragma: no cover - defensive
-            raise ValueError(f"Invalid port in SSL endpoint '{entry}'") from exc
-    else:
-        host = value
-        port = 443
-    host = host.strip()
-    if not host:
-        raise ValueError(f"Invalid SSL endpoint '{entry}'")
-    return host, port
+    return parse_host_port(entry)
 
 
 def check_ssl_certificate(entry: str, threshold_days: int) -> Tuple[bool, int, str]:
     host, port = _parse_host(entry)
     context = ssl.create_default_context()
+    LIMITER.acquire(host, port)
     try:
         with socket.create_connection((host, port), timeout=5) as sock:
             with context.wrap_socket(sock, server_hostname=host) as secured:
@@ -1,11 +1,19 @@
 import json
 import logging
 import os
-from typing import Dict, Optional, Tuple
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
 
 import requests
 
-from core.settings import settings
+from core import settings as settings_module, tracing
+from core.settings import Settings
+from network.auth import AuthError, TokenProvider
+from network.rate_limit import LIMITER, RateLimiter
 
 log = logging.getLogger("it_tester.http")
 
@@ -50,9 +58,12 @@ class FakeHttpClient:
         self.base_url = "mock://it-tester"
         self.timeout = 0
         self.retries = 0
+        self.auth: Optional[TokenProvider] = None
 
-    def request(self, method: str, path: str, **kwargs) -> FakeResponse:
+    def request(self, method: str, path: str, auth: bool = False, **kwargs) -> FakeResponse:
         method = method.upper()
+        if self.auth is not None and auth:
+            self.auth.token()
         if not path.startswith("/"):
             path = f"/{path}"
         route = self._ROUTES.get((method, path))
@@ -67,6 +78,18 @@ class FakeHttpClient:
     def post(self, path: str, **kwargs) -> FakeResponse:
         return self.request("POST", path, **kwargs)
 
+    def reset_memo(self) -> None:
+        return None
+
+    def detached(self) -> "FakeHttpClient":
+        return self
+
+    def close(self) -> None:
+        return None
+
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+
 
 class HttpClient:
     def __init__(
@@ -75,13 +98,24 @@ class HttpClient:
         timeout: int,
         retries: int,
         api_token: str | None = None,
+        coalesce: bool = False,
+        memo_ttl: float = 0.0,
+        limiter: Optional[RateLimiter] = None,
+        auth: Optional[TokenProvider] = None,
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.retries = retries
+        self.coalesce = coalesce
+        self.memo_ttl = memo_ttl
+        self.limiter = limiter
+        self.auth = auth
         self.session = requests.Session()
         if api_token:
             self.session.headers.update({"Authorization": f"Bearer {api_token}"})
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._memo: Dict[str, Tuple[float, requests.Response]] = {}
 
     def _full_url(self, path: str) -> str:
         if path.startswith(("http://", "https://")):
@@ -90,18 +124,152 @@ class HttpClient:
             path = f"/{path}"
         return f"{self.base_url}{path}"
 
-    def request(self, method: str, path: str, **kwargs) -> requests.Response:
+    @staticmethod
+    def _request_key(method: str, url: str, kwargs: Dict[str, Any]) -> Optional[str]:
+        """Identity of a request that is safe to share, or None (bodies, streams, non-idempotent methods)."""
+        if method not in IDEMPOTENT_METHODS or kwargs.get("stream"):
+            return None
+        if any(kwargs.get(name) is not None for name in ("data", "json", "files")):
+            return None
+        parts = [method, url]
+        for name in sorted(kwargs):
+            value = kwargs[name]
+            parts.append(f"{name}={sorted(value.items()) if isinstance(value, dict) else value!r}")
+        return "\n".join(parts)
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        coalesce: Optional[bool] = None,
+        memo: bool = False,
+        auth: bool = False,
+        **kwargs,
+    ) -> requests.Response:
+        """Send a request with retries.
+
+        Identical concurrent idempotent requests share one in-flight response when
+        coalescing is enabled (``coalesce=False`` bypasses it, e.g. for timing-sensitive
+        checks). ``memo=True`` also reuses a response younger than ``memo_ttl`` seconds.
+        ``auth=True`` adds the token provider's bearer token (logging in if needed) and
+        retries a 401 once with a fresh token; other requests never trigger a login.
+        """
+        method = method.upper()
         url = self._full_url(path)
+        with tracing.TRACER.span(f"HTTP {method}", attributes={"http.request.method": method, "url.full": url}) as span:
+            if self.auth is not None and auth:
+                response = self._authorized(method, url, span, coalesce, memo, kwargs)
+            else:
+                response = self._request(method, url, span, coalesce, memo, kwargs)
+            span.set_attribute("http.response.status_code", response.status_code)
+            return response
+
+    def _authorized(
+        self,
+        method: str,
+        url: str,
+        span: Any,
+        coalesce: Optional[bool],
+        memo: bool,
+        kwargs: Dict[str, Any],
+    ) -> requests.Response:
+        token = self.auth.token()
+        response = self._request(method, url, span, coalesce, memo, _with_bearer(kwargs, token))
+        if response.status_code == 401:
+            log.info("401 from %s; retrying with a fresh auth token", url)
+            span.set_attribute("http.auth_refreshed", True)
+            self.auth.invalidate(token)
+            response = self._request(method, url, span, coalesce, memo, _with_bearer(kwargs, self.auth.token()))
+        return response
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        span: Any,
+        coalesce: Optional[bool],
+        memo: bool,
+        kwargs: Dict[str, Any],
+    ) -> requests.Response:
+        key = self._request_key(method, url, kwargs)
+        if key is None:
+            return self._send(method, url, **kwargs)
+
+        if memo and self.memo_ttl > 0:
+            with self._lock:
+                cached = self._memo.get(key)
+            if cached and time.monotonic() - cached[0] < self.memo_ttl:
+                span.set_attribute("http.memo_hit", True)
+                return cached[1]
+
+        share = self.coalesce if coalesce is None else coalesce
+        if not share:
+            response = self._send(method, url, **kwargs)
+        else:
+            with self._lock:
+                flight = self._inflight.get(key)
+                leader = flight is None
+                if leader:
+                    flight = Future()
+                    self._inflight[key] = flight
+            if not leader:
+                log.debug("Coalesced %s %s onto in-flight request", method, url)
+                span.set_attribute("http.coalesced", True)
+                return flight.result()
+            try:
+                response = self._send(method, url, **kwargs)
+                flight.set_result(response)
+            except BaseException as exc:
+                flight.set_exception(exc)
+                raise
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+
+        if memo and self.memo_ttl > 0 and response.status_code < 500:
+            with self._lock:
+                self._memo[key] = (time.monotonic(), response)
+        return response
+
+    def reset_memo(self) -> None:
+        with self._lock:
+            self._memo.clear()
+
+    def detached(self) -> "HttpClient":
+        """Copy with its own connection pool, e.g. to time connection setup; ``close()`` it after use.
+
+        Requests on the copy never share the pooled keep-alive connections, in-flight
+        requests or memo of this client, so concurrent tests are not disturbed.
+        """
+        http = HttpClient(self.base_url, self.timeout, self.retries, limiter=self.limiter, auth=self.auth)
+        http.session.headers.update(self.session.headers)
+        return http
+
+    def close(self) -> None:
+        self.session.close()
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
         last_exc: Optional[Exception] = None
+        target = urlsplit(url) if self.limiter else None
 
         for attempt in range(self.retries + 1):
             try:
-                response = self.session.request(
-                    method,
-                    url,
-                    timeout=self.timeout,
-                    **kwargs,
-                )
+                # Throttling happens before the attempt span so it never counts as request latency.
+                waited = self.limiter.acquire(target.hostname or "", target.port) if target else 0.0
+                with tracing.TRACER.span(
+                    f"HTTP {method} attempt",
+                    kind=tracing.KIND_CLIENT,
+                    attributes={"http.request.method": method, "url.full": url, "http.request.resend_count": attempt},
+                ) as attempt_span:
+                    if waited:
+                        attempt_span.set_attribute("rate_limit.wait_ms", round(waited * 1000, 3))
+                    response = self.session.request(
+                        method,
+                        url,
+                        timeout=self.timeout,
+                        **kwargs,
+                    )
+                    attempt_span.set_attribute("http.response.status_code", response.status_code)
                 if response.status_code in (502, 503, 504) and attempt < self.retries:
                     log.warning(
                         "Received %s for %s; retrying attempt %s",
@@ -139,12 +307,46 @@ class HttpClient:
         return self.request("POST", path, **kwargs)
 
 
-def _should_use_fake_client() -> bool:
+def _with_bearer(kwargs: Dict[str, Any], token: str) -> Dict[str, Any]:
+    headers = dict(kwargs.get("headers") or {})
+    headers["Authorization"] = f"Bearer {token}"
+    return {**kwargs, "headers": headers}
+
+
+def _login(http: FakeHttpClient | HttpClient, profile: Settings) -> Callable[[], Dict[str, Any]]:
+    def login() -> Dict[str, Any]:
+        payload = {"username": profile.AUTH_USERNAME, "password": profile.AUTH_PASSWORD}
+        response = http.request("POST", profile.AUTH_LOGIN_PATH, json=payload)
+        if response.status_code != 200:
+            raise AuthError(f"Login failed with status {response.status_code}")
+        try:
+            data = response.json()
+        except ValueError as exc:
+            raise AuthError(f"Login response is not JSON: {exc}") from exc
+        return data if isinstance(data, dict) else {}
+
+    return login
+
+
+def _token_provider(http: FakeHttpClient | HttpClient, profile: Settings) -> Optional[TokenProvider]:
+    """Login-based auth for a profile with ``AUTH_USERNAME`` (a static ``API_AUTH_TOKEN`` wins)."""
+    if not profile.AUTH_USERNAME or profile.API_AUTH_TOKEN:
+        return None
+    return TokenProvider(
+        _login(http, profile),
+        key=f"{http.base_url}|{profile.AUTH_LOGIN_PATH}|{profile.AUTH_USERNAME}",
+        cache_path=Path(profile.CACHE_DIR) / "auth_tokens.json" if profile.AUTH_TOKEN_CACHE else None,
+        default_ttl=profile.AUTH_TOKEN_TTL,
+        refresh_margin=profile.AUTH_REFRESH_MARGIN,
+    )
+
+
+def _should_use_fake_client(profile: Settings) -> bool:
     override = os.getenv("IT_TESTER_USE_FAKE_API")
     if override is not None:
         return override.lower() in {"1", "true", "yes"}
 
-    base = settings.BASE_API_URL.strip()
+    base = profile.BASE_API_URL.strip()
     if not base:
         return True
     if not base.startswith("http://") and not base.startswith("https://"):
@@ -153,16 +355,61 @@ def _should_use_fake_client() -> bool:
     return base.rstrip("/") == default_base
 
 
-def _create_client() -> FakeHttpClient | HttpClient:
-    if _should_use_fake_client():
-        log.info("Using FakeHttpClient for tests")
-        return FakeHttpClient()
-    return HttpClient(
-        base_url=settings.BASE_API_URL,
-        timeout=settings.TIMEOUT,
-        retries=settings.RETRY_COUNT,
-        api_token=settings.API_AUTH_TOKEN or None,
-    )
+def _create_client(profile: Settings) -> FakeHttpClient | HttpClient:
+    http: FakeHttpClient | HttpClient
+    if _should_use_fake_client(profile):
+        log.info("Using FakeHttpClient for tests (ENV=%s)", profile.ENV)
+        http = FakeHttpClient()
+    else:
+        http = HttpClient(
+            base_url=profile.BASE_API_URL,
+            timeout=profile.TIMEOUT,
+            retries=profile.RETRY_COUNT,
+            api_token=profile.API_AUTH_TOKEN or None,
+            coalesce=profile.HTTP_COALESCE,
+            memo_ttl=profile.HTTP_MEMO_TTL,
+            limiter=LIMITER if LIMITER.enabled else None,
+        )
+    http.auth = _token_provider(http, profile)
+    return http
+
+
+_CLIENTS: Dict[int, Tuple[Settings, FakeHttpClient | HttpClient]] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def client_for(profile: Settings) -> FakeHttpClient | HttpClient:
+    """The shared client of an environment profile, created on first use."""
+    entry = _CLIENTS.get(id(profile))
+    if entry is None:
+        with _CLIENTS_LOCK:
+            entry = _CLIENTS.get(id(profile))
+            if entry is None:
+                entry = _CLIENTS[id(profile)] = (profile, _create_client(profile))
+    return entry[1]
+
+
+def reset_memos() -> None:
+    """Forget memoised responses of every profile's client, so one run never reports another's."""
+    with _CLIENTS_LOCK:
+        entries = list(_CLIENTS.values())
+    for _, http in entries:
+        http.reset_memo()
+
+
+def auth_stats() -> Dict[str, Dict[str, int]]:
+    """Token provider counters per environment (logins vs. cached uses), for the summary."""
+    with _CLIENTS_LOCK:
+        entries = list(_CLIENTS.values())
+    return {profile.ENV: http.auth.stats() for profile, http in entries if http.auth is not None}
+
+
+class ClientProxy:
+    """Module-level ``client``: forwards to the client of the current environment profile."""
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(client_for(settings_module.current()), name)
 
 
-client = _create_client()
+client: FakeHttpClient | HttpClient = ClientProxy()  # type: ignore[assignment]
+client_for(settings_module.current())
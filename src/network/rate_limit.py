@@ -0,0 +1,150 @@
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from core.settings import settings
+from report.reporter import REPORTER
+
+log = logging.getLogger("it_tester.rate_limit")
+
+WAIT_METRIC = "rate_limit_wait_ms"
+
+Limit = Tuple[float, float]
+
+
+class TokenBucket:
+    """``rate`` tokens per second, with up to ``burst`` tokens banked while idle."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None) -> None:
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate = rate
+        self.burst = max(burst if burst is not None else rate, 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return the seconds until it is actually available.
+
+        The balance may go negative, so concurrent callers are queued in arrival order
+        instead of all waking up to race for the next token.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1.0
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+def _parse_limit(value: Any) -> Limit:
+    """``10`` or ``{"rate": 10, "burst": 20}`` -> (rate, burst); burst defaults to the rate."""
+    if isinstance(value, dict):
+        rate = float(value["rate"])
+        burst = float(value.get("burst", rate))
+    else:
+        rate = burst = float(value)
+    if rate <= 0:
+        raise ValueError(f"rate must be positive, got {rate}")
+    return rate, burst
+
+
+class RateLimiter:
+    """Token-bucket limits on outgoing probes, per target host and for the whole process.
+
+    ``hosts`` maps ``host`` or ``host:port`` to its own limit; other hosts each get a
+    bucket with the ``default`` limit (if any). Every request also takes a token from the
+    ``global`` bucket. Waiting time is kept per thread and recorded as the
+    ``rate_limit_wait_ms`` metric of the running test, separately from its latency.
+    """
+
+    def __init__(
+        self,
+        hosts: Optional[Dict[str, Limit]] = None,
+        default: Optional[Limit] = None,
+        global_limit: Optional[Limit] = None,
+    ) -> None:
+        self.hosts = dict(hosts or {})
+        self.default = default
+        self._global = TokenBucket(*global_limit) if global_limit else None
+        self._buckets: Dict[str, TokenBucket] = {key: TokenBucket(*limit) for key, limit in self.hosts.items()}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._waits: Dict[str, Tuple[int, float]] = {}
+
+    @classmethod
+    def from_config(cls, raw: str) -> "RateLimiter":
+        """Build from ``RATE_LIMITS`` JSON: ``{"global": 50, "default": 10, "hosts": {"api.example.com": {"rate": 5, "burst": 10}}}``."""
+        value = (raw or "").strip()
+        if not value:
+            return cls()
+        try:
+            data = json.loads(value)
+            if not isinstance(data, dict):
+                raise ValueError("expected a JSON object")
+            hosts = {str(key).lower(): _parse_limit(limit) for key, limit in (data.get("hosts") or {}).items()}
+            default = _parse_limit(data["default"]) if data.get("default") is not None else None
+            global_limit = _parse_limit(data["global"]) if data.get("global") is not None else None
+        except (ValueError, KeyError, TypeError) as exc:
+            log.warning("RATE_LIMITS yok sayıldı (geçersiz yapılandırma): %s", exc)
+            return cls()
+        return cls(hosts, default, global_limit)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._global or self.hosts or self.default)
+
+    def _bucket(self, host: str, port: Optional[int]) -> Tuple[str, Optional[TokenBucket]]:
+        host = host.lower()
+        if port is not None:
+            key = f"{host}:{port}"
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                return key, bucket
+        bucket = self._buckets.get(host)
+        if bucket is None and self.default:
+            with self._lock:
+                bucket = self._buckets.get(host)
+                if bucket is None:
+                    bucket = self._buckets[host] = TokenBucket(*self.default)
+        return host, bucket
+
+    def acquire(self, host: str, port: Optional[int] = None) -> float:
+        """Block until a request to ``host`` is allowed; returns the seconds waited."""
+        if not self.enabled:
+            return 0.0
+        key, bucket = self._bucket(host or "", port)
+        wait = max(
+            self._global.reserve() if self._global else 0.0,
+            bucket.reserve() if bucket else 0.0,
+        )
+        if wait <= 0:
+            return 0.0
+        time.sleep(wait)
+        wait_ms = wait * 1000
+        self._local.waited_ms = getattr(self._local, "waited_ms", 0.0) + wait_ms
+        REPORTER.record_metric(WAIT_METRIC, wait_ms, accumulate=True)
+        with self._lock:
+            count, total = self._waits.get(key, (0, 0.0))
+            self._waits[key] = (count + 1, total + wait_ms)
+        log.debug("Rate limit: %s için %.1f ms beklendi", key, wait_ms)
+        return wait
+
+    def throttled_ms(self) -> float:
+        """Total time the calling thread has spent waiting on limits (take differences around a measurement)."""
+        return getattr(self._local, "waited_ms", 0.0)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Waits per host bucket so far: how often and how long requests were held back."""
+        with self._lock:
+            return {key: {"waits": count, "wait_ms": round(total, 3)} for key, (count, total) in sorted(self._waits.items())}
+
+
+LIMITER = RateLimiter.from_config(settings.RATE_LIMITS)
+
+
+def throttled_ms() -> float:
+    return LIMITER.throttled_ms()
@@ -0,0 +1,346 @@
+import json
+import logging
+import math
+import random
+import socketserver
+import ssl
+import struct
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple
+
+log = logging.getLogger("it_tester.stub_server")
+
+LatencyFn = Callable[[random.Random], float]
+
+
+def fixed(ms: float) -> LatencyFn:
+    return lambda rng: ms
+
+
+def uniform(low_ms: float, high_ms: float) -> LatencyFn:
+    return lambda rng: rng.uniform(low_ms, high_ms)
+
+
+def lognormal(median_ms: float, sigma: float = 0.5) -> LatencyFn:
+    """Long-tailed latency: median ``median_ms``, tail width ``sigma``."""
+    mu = math.log(max(median_ms, 1e-6))
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+
+@dataclass
+class StubRoute:
+    status: int = 200
+    body: Any = field(default_factory=lambda: {"status": "ok"})
+    headers: Dict[str, str] = field(default_factory=dict)
+    latency: Optional[LatencyFn] = None
+    error_rate: float = 0.0
+    error_status: int = 503
+    drop_rate: float = 0.0
+    chunk_size: int = 0
+    chunk_delay_ms: float = 0.0
+    hits: int = 0
+
+    def payload(self) -> Tuple[bytes, str]:
+        if isinstance(self.body, bytes):
+            return self.body, "application/octet-stream"
+        if isinstance(self.body, str):
+            return self.body.encode("utf-8"), "text/plain; charset=utf-8"
+        return json.dumps(self.body).encode("utf-8"), "application/json"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes; with Nagle on, every keep-alive
+    # response would wait for the client's delayed ACK (~40 ms).
+    disable_nagle_algorithm = True
+    server: "_StubHTTPServer"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - stdlib signature
+        log.debug("stub %s - %s", self.address_string(), format % args)
+
+    def _handle(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        stub = self.server.stub
+        route = stub.match(self.command, self.path.split("?", 1)[0])
+        if route is None:
+            self._respond(404, b'{"error": "no stub route"}', "application/json", {})
+            return
+
+        with stub.lock:
+            route.hits += 1
+            delay_ms = route.latency(stub.rng) if route.latency else 0.0
+            roll = stub.rng.random()
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000.0)
+        if roll < route.drop_rate:
+            # Nothing written: the server closes the socket once this request is done.
+            self.close_connection = True
+            return
+        if roll < route.drop_rate + route.error_rate:
+            self._respond(route.error_status, b'{"error": "injected"}', "application/json", {})
+            return
+        body, content_type = route.payload()
+        self._respond(route.status, body, content_type, route.headers, route.chunk_size, route.chunk_delay_ms)
+
+    def _respond(
+        self,
+        status: int,
+        body: bytes,
+        content_type: str,
+        headers: Dict[str, str],
+        chunk_size: int = 0,
+        chunk_delay_ms: float = 0.0,
+    ) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command == "HEAD":
+            return
+        if chunk_size <= 0:
+            self.wfile.write(body)
+            return
+        for offset in range(0, len(body), chunk_size):
+            self.wfile.write(body[offset : offset + chunk_size])
+            self.wfile.flush()
+            time.sleep(chunk_delay_ms / 1000.0)
+
+    do_GET = _handle
+    do_POST = _handle
+    do_PUT = _handle
+    do_DELETE = _handle
+    do_HEAD = _handle
+    do_OPTIONS = _handle
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, address: Tuple[str, int], stub: "StubServer") -> None:
+        self.stub = stub
+        super().__init__(address, _Handler)
+
+
+class StubServer:
+    """Programmable in-process HTTP(S) API stub for exercising the real ``HttpClient``.
+
+    Routes declare status, body, per-request latency distribution, injected error
+    and connection-drop rates and slow (chunked, delayed) bodies::
+
+        with StubServer() as stub:
+            stub.route("GET", "/health", latency=uniform(5, 20), error_rate=0.01)
+            client = HttpClient(stub.base_url, timeout=2, retries=1)
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        certfile: Optional[str] = None,
+        keyfile: Optional[str] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.routes: Dict[Tuple[str, str], StubRoute] = {}
+        self.lock = threading.Lock()
+        self.rng = random.Random(seed)
+        self._httpd = _StubHTTPServer((host, port), self)
+        self._tls = bool(certfile)
+        if certfile:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(certfile, keyfile)
+            self._httpd.socket = context.wrap_socket(self._httpd.socket, server_side=True)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"{'https' if self._tls else 'http'}://{host}:{port}"
+
+    def route(self, method: str, path: str, **options: Any) -> StubRoute:
+        stub_route = StubRoute(**options)
+        self.routes[(method.upper(), path)] = stub_route
+        return stub_route
+
+    def match(self, method: str, path: str) -> Optional[StubRoute]:
+        return self.routes.get((method.upper(), path))
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="stub-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+class _ProtocolHandler(socketserver.BaseRequestHandler):
+    server: "_ProtocolTCPServer"
+
+    def handle(self) -> None:
+        stub = self.server.stub
+        with stub.lock:
+            stub.connections += 1
+        try:
+            getattr(self, f"_{stub.kind}")(stub)
+        except (OSError, ValueError):
+            pass
+
+    def _delay(self, stub: "ProtocolStubServer") -> None:
+        if stub.latency:
+            with stub.lock:
+                delay_ms = stub.latency(stub.rng)
+            time.sleep(delay_ms / 1000.0)
+
+    def _redis(self, stub: "ProtocolStubServer") -> None:
+        reader = self.request.makefile("rb")
+        while True:
+            line = reader.readline()
+            if not line:
+                return
+            args = line.split()
+            if line.startswith(b"*"):
+                args = []
+                for _ in range(int(line[1:])):
+                    reader.readline()
+                    args.append(reader.readline().strip())
+            self._delay(stub)
+            if stub.refuse:
+                self.request.sendall(b"-LOADING Redis is loading the dataset in memory\r\n")
+            elif stub.auth:
+                self.request.sendall(b"-NOAUTH Authentication required.\r\n")
+            elif args and args[0].upper() == b"PING":
+                self.request.sendall(b"+PONG\r\n")
+            else:
+                self.request.sendall(b"-ERR unknown command\r\n")
+
+    def _postgres(self, stub: "ProtocolStubServer") -> None:
+        length, code = struct.unpack("!ii", self._read(8))
+        if code == 80877103:
+            self.request.sendall(b"N")
+            length, code = struct.unpack("!ii", self._read(8))
+        self._read(length - 8)
+        self._delay(stub)
+        if stub.refuse:
+            fields = b"SFATAL\0C53300\0Msorry, too many clients already\0\0"
+            self.request.sendall(b"E" + struct.pack("!i", len(fields) + 4) + fields)
+        else:
+            # AuthenticationCleartextPassword (3) or AuthenticationOk (0).
+            self.request.sendall(b"R" + struct.pack("!ii", 8, 3 if stub.auth else 0))
+
+    def _mysql(self, stub: "ProtocolStubServer") -> None:
+        self._delay(stub)
+        payload = b"\xff" + struct.pack("<H", 1040) + b"#08004Too many connections"
+        if not stub.refuse:
+            payload = (
+                b"\x0a8.0.36-stub\0"
+                + struct.pack("<I", stub.connections)
+                + b"12345678\0"
+                + struct.pack("<HBHH", 0xFFFF, 33, 2, 0xDFFF)
+                + b"\x15"
+                + b"\0" * 10
+                + b"123456789012\0mysql_native_password\0"
+            )
+        self.request.sendall(len(payload).to_bytes(3, "little") + b"\0" + payload)
+        if stub.refuse:
+            return
+        # Login (HandshakeResponse41): OK, or access denied (1045) with ``auth``; then COM_QUIT.
+        header = self._read(4)
+        self._read(int.from_bytes(header[:3], "little"))
+        reply = b"\xff" + struct.pack("<H", 1045) + b"#28000Access denied" if stub.auth else b"\0\0\0\2\0\0\0"
+        self.request.sendall(len(reply).to_bytes(3, "little") + bytes([header[3] + 1]) + reply)
+        self.request.recv(5)
+
+    def _read(self, size: int) -> bytes:
+        data = b""
+        while len(data) < size:
+            chunk = self.request.recv(size - len(data))
+            if not chunk:
+                raise ValueError("client closed the connection")
+            data += chunk
+        return data
+
+
+class _ProtocolTCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: Tuple[str, int], stub: "ProtocolStubServer") -> None:
+        self.stub = stub
+        super().__init__(address, _ProtocolHandler)
+
+
+class ProtocolStubServer:
+    """Minimal in-process Redis / Postgres / MySQL stand-in for the protocol-level DB probes.
+
+    ``redis`` answers ``PING``, ``postgres`` declines TLS and answers the startup message
+    with an authentication request and ``mysql`` sends a protocol 10 greeting, then
+    accepts a login. With ``auth`` the server asks for credentials (Redis ``-NOAUTH``,
+    Postgres password, MySQL access denied), with ``refuse`` it turns the client away
+    (loading / too many connections).
+    ``connections`` counts accepted sockets::
+
+        with ProtocolStubServer("redis") as stub:
+            probe({"host": stub.host, "port": stub.port, "type": "redis"})
+    """
+
+    KINDS = ("redis", "postgres", "mysql")
+
+    def __init__(
+        self,
+        kind: str,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        auth: bool = False,
+        refuse: bool = False,
+        latency: Optional[LatencyFn] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown protocol stub kind: {kind}")
+        self.kind = kind
+        self.auth = auth
+        self.refuse = refuse
+        self.latency = latency
+        self.connections = 0
+        self.lock = threading.Lock()
+        self.rng = random.Random(seed)
+        self._server = _ProtocolTCPServer((host, port), self)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def host(self) -> str:
+        return self._server.server_address[0]
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self) -> "ProtocolStubServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name=f"stub-{self.kind}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "ProtocolStubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
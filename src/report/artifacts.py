@@ -0,0 +1,88 @@
+import gzip
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+log = logging.getLogger("it_tester.report")
+
+FORMATS = ("json", "json.gz", "json.zst", "msgpack")
+SUMMARY_STEM = "summary"
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def _zstd() -> Any:
+    try:
+        from compression import zstd  # type: ignore  # python 3.14+
+
+        return zstd
+    except ImportError:
+        pass
+    try:
+        import zstandard  # type: ignore
+    except ImportError as exc:
+        raise RuntimeError("zstd artifacts require Python 3.14+ or the 'zstandard' package") from exc
+    return zstandard
+
+
+def _msgpack() -> Any:
+    try:
+        import msgpack  # type: ignore
+    except ImportError as exc:
+        raise RuntimeError("msgpack artifacts require the 'msgpack' package") from exc
+    return msgpack
+
+
+def summary_name(fmt: str) -> str:
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown artifact format: {fmt}")
+    return f"{SUMMARY_STEM}.{fmt}"
+
+
+def dumps(data: Dict[str, Any], fmt: str) -> bytes:
+    if fmt == "json":
+        return json.dumps(data, indent=2).encode("utf-8")
+    if fmt == "msgpack":
+        return _msgpack().packb(data, use_bin_type=True)
+    compact = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    if fmt == "json.gz":
+        # mtime=0 keeps identical summaries byte-identical (stable object-store ETags).
+        return gzip.compress(compact, compresslevel=6, mtime=0)
+    if fmt == "json.zst":
+        return _zstd().compress(compact, level=10)
+    raise ValueError(f"Unknown artifact format: {fmt}")
+
+
+def loads(data: bytes) -> Dict[str, Any]:
+    """Decode any supported artifact, detected from its leading bytes rather than the file name."""
+    if data.startswith(_GZIP_MAGIC):
+        data = gzip.decompress(data)
+    elif data.startswith(_ZSTD_MAGIC):
+        data = _zstd().decompress(data)
+    if data[:64].lstrip()[:1] in (b"{", b"["):
+        return json.loads(data)
+    return _msgpack().unpackb(data, raw=False)
+
+
+def dump_summary(summary: Dict[str, Any], output_dir: Path, fmt: str = "json") -> Path:
+    output = Path(output_dir) / summary_name(fmt)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output.with_name(f".{output.name}.tmp")
+    tmp.write_bytes(dumps(summary, fmt))
+    tmp.replace(output)
+    return output
+
+
+def load_summary(path: Path) -> Dict[str, Any]:
+    return loads(Path(path).read_bytes())
+
+
+def find_summary(directory: Path) -> Optional[Path]:
+    """Newest summary artifact in ``directory`` in any supported format."""
+    candidates = [Path(directory) / summary_name(fmt) for fmt in FORMATS]
+    existing = [path for path in candidates if path.exists()]
+    if not existing:
+        return None
+    return max(existing, key=lambda path: path.stat().st_mtime_ns)
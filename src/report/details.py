@@ -0,0 +1,83 @@
+import functools
+import hashlib
+import logging
+import shutil
+from pathlib import Path
+from typing import Dict, Union
+
+log = logging.getLogger("it_tester.report")
+
+
+@functools.lru_cache(maxsize=256)
+def _read(path: str) -> str:
+    try:
+        return Path(path).read_text(encoding="utf-8")
+    except OSError as exc:
+        return f"<detail unavailable: {exc}>"
+
+
+class SpooledDetail:
+    """Handle for a result detail that a ``DetailStore`` moved to disk."""
+
+    __slots__ = ("path", "size")
+
+    def __init__(self, path: Path, size: int) -> None:
+        self.path = path
+        self.size = size
+
+    def read(self) -> str:
+        return _read(str(self.path))
+
+    def __repr__(self) -> str:
+        return f"SpooledDetail({self.path.name}, {self.size} chars)"
+
+
+Detail = Union[str, SpooledDetail]
+
+
+class DetailStore:
+    """De-duplicates result details and spools large ones to disk.
+
+    Details of at least ``threshold`` characters are written once per content hash
+    to ``directory`` and replaced by a ``SpooledDetail``; identical smaller details
+    share one string object. ``threshold=0`` disables spooling.
+    """
+
+    def __init__(self, directory: Path, threshold: int = 4096, max_interned: int = 10000) -> None:
+        self.directory = Path(directory)
+        self.threshold = threshold
+        self.max_interned = max_interned
+        self._interned: Dict[str, str] = {}
+        self._spooled: Dict[str, SpooledDetail] = {}
+
+    def compact(self, details: str) -> Detail:
+        if not details:
+            return ""
+        if self.threshold and len(details) >= self.threshold:
+            digest = hashlib.sha1(details.encode("utf-8")).hexdigest()
+            spooled = self._spooled.get(digest)
+            if spooled is None:
+                path = self.directory / f"{digest}.txt"
+                try:
+                    self.directory.mkdir(parents=True, exist_ok=True)
+                    path.write_text(details, encoding="utf-8")
+                except OSError as exc:
+                    log.warning("Could not spool result details to %s: %s", path, exc)
+                    return details
+                spooled = self._spooled[digest] = SpooledDetail(path, len(details))
+            return spooled
+        shared = self._interned.get(details)
+        if shared is not None:
+            return shared
+        if len(self._interned) < self.max_interned:
+            self._interned[details] = details
+        return details
+
+    def stats(self) -> Dict[str, int]:
+        return {"interned": len(self._interned), "spooled": len(self._spooled)}
+
+    def clear(self) -> None:
+        self._interned.clear()
+        self._spooled.clear()
+        _read.cache_clear()
+        shutil.rmtree(self.directory, ignore_errors=True)
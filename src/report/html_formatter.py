@@ -8,7 +8,7 @@ def render_html(summary: Dict[str, Any], results: List[TestResult]) -> str:
     for r in results:
         if r.status == "PASSED":
             color = "#4caf50"
-        elif r.status in ("FAILED", "ERROR"):
+        elif r.status in ("FAILED", "ERROR", "TIMEOUT"):
             color = "#f44336"
         else:
             color = "#9e9e9e"
@@ -78,6 +78,7 @@ def render_html(summary: Dict[str, Any], results: List[TestResult]) -> str:
       <span><strong>Passed:</strong> {summary["passed"]}</span>
       <span><strong>Failed:</strong> {summary["failed"]}</span>
       <span><strong>Error:</strong> {summary["error"]}</span>
+      <span><strong>Timeout:</strong> {summary.get("timeout", 0)}</span>
       <span><strong>Anomaly:</strong> {summary["anomaly_count"]}</span>
       <span><strong>Total Time (ms):</strong> {summary["total_duration_ms"]:.2f}</span>
     </div>
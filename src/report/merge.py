@@ -0,0 +1,126 @@
+import argparse
+import json
+import logging
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any, Dict, List
+
+from report import artifacts
+from report.reporter import Reporter, TestResult
+
+log = logging.getLogger("it_tester.merge")
+
+
+def _load_junit(path: Path) -> Dict[str, Any]:
+    root = ET.parse(path).getroot()
+    suites = [root] if root.tag == "testsuite" else list(root.iter("testsuite"))
+    results: List[Dict[str, Any]] = []
+    total_time_s = 0.0
+    for suite in suites:
+        total_time_s = max(total_time_s, float(suite.get("time", 0) or 0))
+        for case in suite.iter("testcase"):
+            status, details = "PASSED", ""
+            for tag, case_status in (("failure", "FAILED"), ("error", "ERROR"), ("skipped", "SKIPPED")):
+                node = case.find(tag)
+                if node is not None:
+                    status = node.get("message") if tag == "error" and node.get("message") else case_status
+                    details = node.text or ""
+                    break
+            tags = ""
+            for prop in case.iter("property"):
+                if prop.get("name") == "tags":
+                    tags = prop.get("value", "")
+            results.append(
+                {
+                    "name": case.get("name", ""),
+                    "status": status,
+                    "duration_ms": float(case.get("time", 0) or 0) * 1000,
+                    "tags": [tag for tag in tags.split(",") if tag],
+                    "details": details,
+                }
+            )
+    return {"total_duration_ms": total_time_s * 1000, "results": results}
+
+
+def load_report(path: Path) -> Dict[str, Any]:
+    if path.suffix.lower() == ".xml":
+        return _load_junit(path)
+    return artifacts.load_summary(path)
+
+
+def merge_reports(paths: List[Path], output_dir: str) -> Reporter:
+    """Combine shard outputs into one Reporter; later inputs win on duplicate test names."""
+    merged: Dict[str, TestResult] = {}
+    envs: List[str] = []
+    base_urls: List[str] = []
+    shards: List[Dict[str, Any]] = []
+    started: List[float] = []
+    finished: List[float] = []
+    longest_ms = 0.0
+
+    for path in paths:
+        data = load_report(path)
+        for item in data.get("results", []):
+            merged[item.get("name", "")] = TestResult(
+                name=item.get("name", ""),
+                status=item.get("status", "ERROR"),
+                duration_ms=item.get("duration_ms"),
+                details=item.get("details") or "",
+                tags=list(item.get("tags") or []),
+                metrics=dict(item.get("metrics") or {}),
+            )
+        for key, bucket in (("env", envs), ("base_api_url", base_urls)):
+            value = data.get(key)
+            if value and value not in bucket:
+                bucket.append(value)
+        if data.get("started_at") and data.get("finished_at"):
+            started.append(float(data["started_at"]))
+            finished.append(float(data["finished_at"]))
+        longest_ms = max(longest_ms, float(data.get("total_duration_ms") or 0.0))
+        shards.append({"source": str(path), "shard": data.get("shard"), "total": len(data.get("results", []))})
+
+    reporter = Reporter(output_dir=output_dir)
+    reporter.results = list(merged.values())
+    if started and len(started) == len(paths):
+        reporter.started_at, reporter.finished_at = min(started), max(finished)
+    else:
+        reporter.started_at, reporter.finished_at = 0.0, longest_ms / 1000
+    reporter.meta = {"merged_from": shards}
+    if envs:
+        reporter.meta["env"] = ",".join(envs)
+    if base_urls:
+        reporter.meta["base_api_url"] = ",".join(base_urls)
+    return reporter
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog="main.py merge", description="Shard raporlarını (summary.json / junit.xml) birleştir")
+    parser.add_argument("inputs", nargs="+", help="Birleştirilecek summary.* (json, json.gz, json.zst, msgpack) veya junit.xml dosyaları")
+    parser.add_argument("--output-dir", default="reports/merged", help="Birleşik raporların yazılacağı dizin")
+    parser.add_argument(
+        "--format",
+        choices=["json", "junit", "html", "all"],
+        default="all",
+        help="Çıktı formatı (varsayılan: all)",
+    )
+    parser.add_argument(
+        "--artifact-format",
+        choices=list(artifacts.FORMATS),
+        default="json",
+        help="Birleşik özet dosyasının formatı",
+    )
+    args = parser.parse_args(argv)
+
+    reporter = merge_reports([Path(item) for item in args.inputs], args.output_dir)
+    summary = reporter.summary_dict()
+    outputs: Dict[str, str] = {"json": str(reporter.save_summary(args.artifact_format))}
+    if args.format in ("junit", "all"):
+        outputs["junit"] = str(reporter.save_junit())
+    if args.format in ("html", "all"):
+        outputs["html"] = str(reporter.save_html())
+    summary["outputs"] = outputs
+    summary.pop("results", None)
+    print(json.dumps(summary, indent=2))
+
+    failed_or_error = summary.get("failed", 0) + summary.get("error", 0) + summary.get("timeout", 0)
+    return 1 if failed_or_error > 0 else 0
@@ -0,0 +1,129 @@
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+STATUSES = ("PASSED", "FAILED", "ERROR", "TIMEOUT", "SKIPPED")
+DURATION_BUCKETS_S = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PREFIX = "it_tester"
+
+LabelKey = Tuple[str, str]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(key: LabelKey, **extra: str) -> str:
+    pairs = [("test", key[0]), ("tags", key[1])] + list(extra.items())
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _metric_name(key: str) -> Tuple[str, float]:
+    """Map a result metric key to an exposition name and unit scale (``*_ms`` -> seconds)."""
+    base = re.sub(r"[^a-zA-Z0-9_]", "_", key).strip("_").lower()
+    if base.endswith("_ms"):
+        return f"{PREFIX}_{base[:-3]}_seconds", 0.001
+    return f"{PREFIX}_{base}", 1.0
+
+
+class _Histogram:
+    __slots__ = ("buckets", "count", "total")
+
+    def __init__(self) -> None:
+        self.buckets = [0] * len(DURATION_BUCKETS_S)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        for index, bound in enumerate(DURATION_BUCKETS_S):
+            if value <= bound:
+                self.buckets[index] += 1
+
+
+class MetricsRegistry:
+    """Incrementally updated probe metrics rendered in Prometheus/OpenMetrics text format.
+
+    Every ``observe`` touches only the series of one test, and ``render`` walks the
+    current series once, so exposition cost is O(series) regardless of result history.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._status: Dict[LabelKey, str] = {}
+        self._durations: Dict[LabelKey, _Histogram] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._results_total: Dict[str, int] = {}
+        self._last_result_at = 0.0
+
+    def observe(self, result: Any) -> None:
+        key: LabelKey = (result.name, ",".join(result.tags))
+        metrics = getattr(result, "metrics", None) or {}
+        with self._lock:
+            self._status[key] = result.status
+            self._results_total[result.status] = self._results_total.get(result.status, 0) + 1
+            self._last_result_at = time.time()
+            if result.duration_ms is not None:
+                self._durations.setdefault(key, _Histogram()).observe(result.duration_ms / 1000.0)
+            for metric_key, value in metrics.items():
+                try:
+                    self._gauges.setdefault(metric_key, {})[key] = float(value)
+                except (TypeError, ValueError):
+                    continue
+
+    def observe_summary(self, summary: Dict[str, Any]) -> None:
+        from report.reporter import TestResult
+
+        for item in summary.get("results", []):
+            self.observe(
+                TestResult(
+                    name=item.get("name", ""),
+                    status=item.get("status", "ERROR"),
+                    duration_ms=item.get("duration_ms"),
+                    tags=list(item.get("tags") or []),
+                    metrics=dict(item.get("metrics") or {}),
+                )
+            )
+
+    def render(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            lines.append(f"# HELP {PREFIX}_test_status Last status of each test (one-hot by status).")
+            lines.append(f"# TYPE {PREFIX}_test_status gauge")
+            for key, status in self._status.items():
+                for candidate in STATUSES + ((status,) if status not in STATUSES else ()):
+                    lines.append(f"{PREFIX}_test_status{_labels(key, status=candidate)} {1 if candidate == status else 0}")
+
+            lines.append(f"# HELP {PREFIX}_test_duration_seconds Test duration.")
+            lines.append(f"# TYPE {PREFIX}_test_duration_seconds histogram")
+            for key, histogram in self._durations.items():
+                for bound, count in zip(DURATION_BUCKETS_S, histogram.buckets):
+                    lines.append(f"{PREFIX}_test_duration_seconds_bucket{_labels(key, le=repr(bound))} {count}")
+                lines.append(f"{PREFIX}_test_duration_seconds_bucket{_labels(key, le='+Inf')} {histogram.count}")
+                lines.append(f"{PREFIX}_test_duration_seconds_sum{_labels(key)} {histogram.total}")
+                lines.append(f"{PREFIX}_test_duration_seconds_count{_labels(key)} {histogram.count}")
+
+            for metric_key in sorted(self._gauges):
+                name, scale = _metric_name(metric_key)
+                lines.append(f"# TYPE {name} gauge")
+                for key, value in self._gauges[metric_key].items():
+                    lines.append(f"{name}{_labels(key)} {value * scale}")
+
+            lines.append(f"# TYPE {PREFIX}_results_total counter")
+            for status, count in sorted(self._results_total.items()):
+                lines.append(f'{PREFIX}_results_total{{status="{_escape(status)}"}} {count}')
+            lines.append(f"# TYPE {PREFIX}_last_result_timestamp_seconds gauge")
+            lines.append(f"{PREFIX}_last_result_timestamp_seconds {self._last_result_at}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: Optional[Path] = None) -> Path:
+        """Atomically write the exposition for the node_exporter textfile collector."""
+        output = Path(path) if path else Path("reports/metrics.prom")
+        output.parent.mkdir(parents=True, exist_ok=True)
+        tmp = output.with_name(f".{output.name}.tmp")
+        tmp.write_text(self.render(), encoding="utf-8")
+        tmp.replace(output)
+        return output
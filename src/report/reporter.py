@@ -1,62 +1,229 @@
-import json
 import logging
 import math
+import threading
 import time
-from dataclasses import dataclass, field
+from collections import Counter
+from contextlib import contextmanager
+from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+from xml.sax.saxutils import quoteattr
 
 from core.settings import settings
+from report import artifacts
+from report.details import Detail, DetailStore
+from report.metrics import MetricsRegistry
 
 log = logging.getLogger("it_tester.report")
 
 
-@dataclass
+class Status(str, Enum):
+    PASSED = "PASSED"
+    FAILED = "FAILED"
+    ERROR = "ERROR"
+    TIMEOUT = "TIMEOUT"
+    SKIPPED = "SKIPPED"
+
+    __str__ = str.__str__
+
+
+# Results keep the member's value: an exact (interned) str compares and formats at
+# full speed in the report hot paths, while ``Status(result.status)`` recovers the enum.
+_STATUSES: Dict[str, str] = {status.value: status.value for status in Status}
+_TAGS: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+_NO_METRICS: Mapping[str, float] = MappingProxyType({})
+
+
+def intern_tags(tags: Iterable[str]) -> Tuple[str, ...]:
+    """One shared tuple per distinct tag set."""
+    key = tuple(tags)
+    return _TAGS.setdefault(key, key)
+
+
 class TestResult:
-    name: str
-    status: str
-    duration_ms: Optional[float] = None
-    details: str = ""
-    tags: List[str] = field(default_factory=list)
+    """Outcome of one test case.
+
+    Slot-based with interned tags, since a daemon window may hold millions of these.
+    ``status`` is normalised through ``Status`` (unknown values are kept as given);
+    ``details`` may be spooled to disk by the reporter and is read back on access.
+    """
+
+    __slots__ = ("name", "status", "duration_ms", "_details", "tags", "_metrics")
+
+    def __init__(
+        self,
+        name: str,
+        status: str,
+        duration_ms: Optional[float] = None,
+        details: str = "",
+        tags: Iterable[str] = (),
+        metrics: Optional[Dict[str, float]] = None,
+    ) -> None:
+        self.name = name
+        self.status = _STATUSES.get(status, status)
+        self.duration_ms = duration_ms
+        self._details: Detail = details
+        self.tags = intern_tags(tags)
+        self._metrics = metrics or None
+
+    @property
+    def details(self) -> str:
+        details = self._details
+        return details if isinstance(details, str) else details.read()
+
+    @details.setter
+    def details(self, value: str) -> None:
+        self._details = value
+
+    @property
+    def metrics(self) -> Mapping[str, float]:
+        """Read-only view; assign a new dict to change it (most results carry none)."""
+        return self._metrics if self._metrics is not None else _NO_METRICS
+
+    @metrics.setter
+    def metrics(self, value: Dict[str, float]) -> None:
+        self._metrics = value or None
+
+    def compact(self, store: DetailStore) -> None:
+        if isinstance(self._details, str):
+            self._details = store.compact(self._details)
+
+    def _fields(self) -> Tuple[Any, ...]:
+        return (self.name, self.status, self.duration_ms, self.details, list(self.tags), dict(self._metrics or {}))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TestResult):
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return (
+            f"TestResult(name={self.name!r}, status={self.status!r}, duration_ms={self.duration_ms!r}, "
+            f"details={self._details!r}, tags={list(self.tags)!r}, metrics={self._metrics or {}!r})"
+        )
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Spooled details are resolved so the receiving process does not depend on our spool.
+        return TestResult, (self.name, self.status, self.duration_ms, self.details, self.tags, self._metrics)
+
+
+def anomaly_count(durations: List[float], threshold: float) -> int:
+    if len(durations) < 3:
+        return 0
+    avg = sum(durations) / len(durations)
+    variance = sum((duration - avg) ** 2 for duration in durations) / len(durations)
+    std_dev = math.sqrt(variance)
+    if std_dev == 0:
+        return 0
+    anomalies = [duration for duration in durations if abs(duration - avg) > threshold * std_dev]
+    return len(anomalies)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(math.ceil(pct / 100.0 * len(sorted_values))), 1)
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def latency_stats(durations: List[float]) -> Dict[str, Any]:
+    ordered = sorted(durations)
+    if not ordered:
+        return {"count": 0}
+    return {
+        "count": len(ordered),
+        "min_ms": ordered[0],
+        "avg_ms": sum(ordered) / len(ordered),
+        "p50_ms": percentile(ordered, 50),
+        "p95_ms": percentile(ordered, 95),
+        "p99_ms": percentile(ordered, 99),
+        "max_ms": ordered[-1],
+    }
 
 
 class Reporter:
-    def __init__(self) -> None:
-        Path("reports").mkdir(exist_ok=True)
+    def __init__(self, output_dir: str = "reports") -> None:
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
         self.results: List[TestResult] = []
         self.started_at: float = time.time()
+        self.finished_at: Optional[float] = None
+        self.meta: Dict[str, Any] = {}
+        self.metrics = MetricsRegistry()
+        self.details = DetailStore(self.output_dir / "details", settings.DETAIL_SPOOL_BYTES)
+        self._local = threading.local()
+
+    def reset(self) -> None:
+        """Start a fresh result window (e.g. between benchmark or daemon iterations)."""
+        self.results = []
+        self.started_at = time.time()
+        self.finished_at = None
+        self.meta = {}
+        self.metrics = MetricsRegistry()
+        self.details.clear()
 
     def add(self, result: TestResult) -> None:
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is not None:
+            buffer.append(result)
+            return
+        result.compact(self.details)
         self.results.append(result)
+        self.metrics.observe(result)
+
+    @contextmanager
+    def capture(self) -> Iterator[List[TestResult]]:
+        """Collect results added by the current thread instead of publishing them.
+
+        Values passed to ``record_metric`` meanwhile are attached to every captured result.
+        """
+        buffer: List[TestResult] = []
+        recorded: Dict[str, float] = {}
+        previous = getattr(self._local, "buffer", None), getattr(self._local, "metrics", None)
+        self._local.buffer, self._local.metrics = buffer, recorded
+        try:
+            yield buffer
+        finally:
+            if recorded:
+                for result in buffer:
+                    result.metrics = {**recorded, **result.metrics}
+            self._local.buffer, self._local.metrics = previous
+
+    def record_metric(self, key: str, value: float, accumulate: bool = False) -> None:
+        recorded = getattr(self._local, "metrics", None)
+        if recorded is not None:
+            recorded[key] = recorded.get(key, 0.0) + value if accumulate else value
+
+    def durations(self) -> List[float]:
+        return [result.duration_ms for result in self.results if result.duration_ms is not None]
 
     def anomaly_count(self) -> int:
-        durations = [result.duration_ms for result in self.results if result.duration_ms is not None]
-        if len(durations) < 3:
-            return 0
-        avg = sum(durations) / len(durations)
-        variance = sum((duration - avg) ** 2 for duration in durations) / len(durations)
-        std_dev = math.sqrt(variance)
-        if std_dev == 0:
-            return 0
-        anomalies = [duration for duration in durations if abs(duration - avg) > settings.ANOMALY_THRESHOLD * std_dev]
-        return len(anomalies)
+        return anomaly_count(self.durations(), settings.ANOMALY_THRESHOLD)
+
+    def elapsed_ms(self) -> float:
+        return ((self.finished_at or time.time()) - self.started_at) * 1000
 
     def summary_dict(self) -> Dict[str, Any]:
-        total_time_ms = (time.time() - self.started_at) * 1000
-        passed = [result for result in self.results if result.status == "PASSED"]
-        failed = [result for result in self.results if result.status == "FAILED"]
-        errors = [result for result in self.results if result.status == "ERROR"]
-        skipped = [result for result in self.results if result.status == "SKIPPED"]
-        return {
+        total_time_ms = self.elapsed_ms()
+        counts = Counter(result.status for result in self.results)
+        summary = {
             "env": settings.ENV,
             "base_api_url": settings.BASE_API_URL,
             "total": len(self.results),
-            "passed": len(passed),
-            "failed": len(failed),
-            "error": len(errors),
-            "skipped": len(skipped),
+            "passed": counts[Status.PASSED],
+            "failed": counts[Status.FAILED],
+            "error": counts[Status.ERROR],
+            "skipped": counts[Status.SKIPPED],
+            "timeout": counts[Status.TIMEOUT],
             "anomaly_count": self.anomaly_count(),
             "total_duration_ms": total_time_ms,
+            "started_at": self.started_at,
+            "finished_at": self.started_at + total_time_ms / 1000,
+            "latency": latency_stats(self.durations()),
             "results": [
                 {
                     "name": result.name,
@@ -64,22 +231,27 @@ class Reporter:
                     "duration_ms": result.duration_ms,
                     "tags": result.tags,
                     "details": result.details,
+                    "metrics": result._metrics or {},
                 }
                 for result in self.results
             ],
         }
+        summary.update(self.meta)
+        return summary
 
     def save_json(self) -> Path:
-        output = Path("reports/summary.json")
-        output.write_text(json.dumps(self.summary_dict(), indent=2), encoding="utf-8")
-        return output
+        return self.save_summary("json")
+
+    def save_summary(self, fmt: str = "json") -> Path:
+        """Write the summary as ``summary.<fmt>``: json, json.gz, json.zst or msgpack."""
+        return artifacts.dump_summary(self.summary_dict(), self.output_dir, fmt)
 
     def save_junit(self) -> Path:
         total = len(self.results)
         failures = len([result for result in self.results if result.status == "FAILED"])
-        errors = len([result for result in self.results if result.status == "ERROR"])
+        errors = len([result for result in self.results if result.status in ("ERROR", "TIMEOUT")])
         skipped = len([result for result in self.results if result.status == "SKIPPED"])
-        total_time_s = time.time() - self.started_at
+        total_time_s = self.elapsed_ms() / 1000
 
         lines: List[str] = [
             '<?xml version="1.0" encoding="UTF-8"?>',
@@ -88,27 +260,32 @@ class Reporter:
 
         for result in self.results:
             duration_s = (result.duration_ms or 0.0) / 1000.0
-            lines.append(f'  <testcase classname="it_tester" name="{result.name}" time="{duration_s:.3f}">')
+            lines.append(f'  <testcase classname="it_tester" name={quoteattr(result.name)} time="{duration_s:.3f}">')
+            if result.tags:
+                lines.append(f'    <properties><property name="tags" value={quoteattr(",".join(result.tags))}/></properties>')
             if result.status == "FAILED":
                 lines.append(f'    <failure message="FAILED"><![CDATA[{result.details}]]></failure>')
-            elif result.status == "ERROR":
-                lines.append(f'    <error message="ERROR"><![CDATA[{result.details}]]></error>')
+            elif result.status in ("ERROR", "TIMEOUT"):
+                lines.append(f'    <error message="{result.status}"><![CDATA[{result.details}]]></error>')
             elif result.status == "SKIPPED":
                 lines.append(f'    <skipped message="SKIPPED"><![CDATA[{result.details}]]></skipped>')
             lines.append("  </testcase>")
 
         lines.append("</testsuite>")
         xml_content = "\n".join(lines)
-        output = Path("reports/junit.xml")
+        output = self.output_dir / "junit.xml"
         output.write_text(xml_content, encoding="utf-8")
         return output
 
+    def save_prometheus(self, path: Optional[str] = None) -> Path:
+        return self.metrics.write_textfile(Path(path) if path else self.output_dir / "metrics.prom")
+
     def save_html(self) -> Path:
         from report import html_formatter
 
         summary = self.summary_dict()
         html_output = html_formatter.render_html(summary, self.results)
-        output = Path("reports/report.html")
+        output = self.output_dir / "report.html"
         output.write_text(html_output, encoding="utf-8")
         return output
 
@@ -1,14 +1,19 @@
 import html
-import json
 import os
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict
 
 import requests
 from flask import Flask, Response, jsonify, request
 
+from report import artifacts
+from report.metrics import MetricsRegistry
+
 app = Flask(__name__)
 
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+_METRICS_CACHE: Dict[str, Any] = {"key": None, "body": ""}
+
 
 def load_summary():
   """Load summary data from remote URL or local file."""
@@ -18,15 +23,15 @@ def load_summary():
       timeout = float(os.environ.get("SUMMARY_REQUEST_TIMEOUT", "5"))
       response = requests.get(remote_url, timeout=timeout)
       response.raise_for_status()
-      return response.json()
+      return artifacts.loads(response.content)
     except Exception:  # noqa: BLE001 - best-effort remote fetch
       pass
 
-  summary_path = Path("reports/summary.json")
-  if not summary_path.exists():
+  summary_path = artifacts.find_summary(Path("reports"))
+  if summary_path is None:
     return None
   try:
-    return json.loads(summary_path.read_text(encoding="utf-8"))
+    return artifacts.load_summary(summary_path)
   except Exception:  # noqa: BLE001 - resilient dashboard
     return None
 
@@ -60,6 +65,32 @@ def api_summary():
     return jsonify(summary)
 
 
+def _metrics_body() -> str:
+  """Serve the runner's textfile output, or render (and cache per file version) from the summary."""
+  summary_path = artifacts.find_summary(Path("reports"))
+  textfile = Path(os.environ.get("METRICS_TEXTFILE") or "reports/metrics.prom")
+  summary_mtime = summary_path.stat().st_mtime_ns if summary_path is not None else None
+  if textfile.exists() and (summary_mtime is None or textfile.stat().st_mtime_ns >= summary_mtime):
+    return textfile.read_text(encoding="utf-8")
+
+  key = None if os.environ.get("SUMMARY_SOURCE_URL") else summary_mtime
+  if key is not None and _METRICS_CACHE["key"] == key:
+    return _METRICS_CACHE["body"]
+  registry = MetricsRegistry()
+  summary = load_summary()
+  if summary is not None:
+    registry.observe_summary(summary)
+  body = registry.render()
+  if key is not None:
+    _METRICS_CACHE.update({"key": key, "body": body})
+  return body
+
+
+@app.get("/metrics")
+def metrics():
+    return Response(_metrics_body(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
 @app.get("/")
 def index():
     summary = load_summary()
@@ -70,7 +101,7 @@ def index():
     rows = []
     for result in summary.get("results", []):
         status = result.get("status", "UNKNOWN")
-        color = "#4caf50" if status == "PASSED" else "#f44336" if status in {"FAILED", "ERROR"} else "#9e9e9e"
+        color = "#4caf50" if status == "PASSED" else "#f44336" if status in {"FAILED", "ERROR", "TIMEOUT"} else "#9e9e9e"
         tags_str = ", ".join(result.get("tags", []))
         duration_value = result.get("duration_ms")
         duration = f"{duration_value:.2f}" if duration_value is not None else "-"
@@ -138,6 +169,7 @@ def index():
       <span><strong>Passed:</strong> {summary['passed']}</span>
       <span><strong>Failed:</strong> {summary['failed']}</span>
       <span><strong>Error:</strong> {summary['error']}</span>
+      <span><strong>Timeout:</strong> {summary.get('timeout', 0)}</span>
       <span><strong>Anomaly:</strong> {summary['anomaly_count']}</span>
       <span><strong>Total Time (ms):</strong> {summary['total_duration_ms']:.2f}</span>
     </div>
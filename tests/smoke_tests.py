@@ -1,17 +1,18 @@
 import time
 
-from core.registry import test
+from core.registry import perf, test
 from core.assertions import check, TestAssertionError
 from core.settings import settings
 from network.http_client import client
+from network.rate_limit import throttled_ms
 from report.reporter import REPORTER, TestResult
 
 
 @test(name="API Healthcheck", tags=["smoke", "api"])
 def test_health():
-    start = time.time()
+    start, throttled = time.time(), throttled_ms()
     resp = client.get("/health")
-    elapsed_ms = (time.time() - start) * 1000
+    elapsed_ms = (time.time() - start) * 1000 - (throttled_ms() - throttled)
 
     check(resp.status_code == 200, f"Status 200 bekleniyordu, geldi: {resp.status_code}")
     try:
@@ -31,23 +32,25 @@ def test_health():
     )
 
 
-@test(name="API Health Performance", tags=["perf", "api"])
-def perf_health():
-    start = time.time()
-    resp = client.get("/health")
-    elapsed_ms = (time.time() - start) * 1000
+@perf(
+    name="API Health Performance",
+    tags=["perf", "api"],
+    depends_on=["API Healthcheck"],
+    samples=lambda: settings.PERF_SAMPLES,
+    warmup=lambda: settings.PERF_WARMUP,
+    percentile=lambda: settings.PERF_PERCENTILE,
+    limit_ms=lambda: settings.PERF_LIMIT_MS,
+)
+def perf_health(cold: bool) -> float:
+    # A cold sample connects on a throwaway client; the shared pool stays warm for other tests.
+    http = client.detached() if cold else client
+    try:
+        start, throttled = time.perf_counter(), throttled_ms()
+        resp = http.get("/health", coalesce=False)
+        elapsed_ms = (time.perf_counter() - start) * 1000 - (throttled_ms() - throttled)
+    finally:
+        if cold:
+            http.close()
 
     check(resp.status_code == 200, f"Status 200 bekleniyordu, geldi: {resp.status_code}")
-    check(
-        elapsed_ms < settings.PERF_LIMIT_MS,
-        f"Health endpoint {settings.PERF_LIMIT_MS} ms altında olmalı, ölçülen: {elapsed_ms:.2f} ms",
-    )
-
-    REPORTER.add(
-        TestResult(
-            name="API Health Performance",
-            status="PASSED",
-            duration_ms=elapsed_ms,
-            tags=["perf", "api"],
-        )
-    )
+    return elapsed_ms